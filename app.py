@@ -5,12 +5,19 @@ Triggers the Research Review Loop workflow via the Kibana API, polls for complet
 and displays the full literature review report and peer review.
 """
 
+import hashlib
+import json
 import os
+import queue
+import threading
 import time
+import orjson
 import requests
 import streamlit as st
 from pathlib import Path
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 load_dotenv()
 
@@ -26,38 +33,184 @@ HEADERS = {
     "Authorization": f"ApiKey {ELASTIC_API_KEY}",
 }
 
-POLL_INTERVAL = 10  # seconds between status checks
+POLL_ACTIVE_INTERVAL = 2  # seconds between status checks while steps are progressing
+POLL_MAX_INTERVAL = 60  # cap for the backoff once progress stalls
+POLL_STABLE_ROUNDS = 3  # unchanged polls before backing off
+
+TERMINAL_STATUSES = ("completed", "failed", "error")
+
+# Step IDs per review-loop iteration, latest first:
+# (version, researcher draft, peer review, parsed verdict)
+FINAL_ITERATION = 3
+ITERATIONS = tuple(
+    (i, f"researcher_draft_v{i}", f"review_v{i}", f"parse_verdict_v{i}")
+    for i in range(FINAL_ITERATION, 0, -1)
+)
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Return a shared HTTP session for Kibana calls.
+
+    Cached as a Streamlit resource so polls (and script reruns) reuse one
+    keep-alive TCP/TLS connection instead of opening a new one per request.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=4,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 
 def load_workflow_yaml() -> str:
-    """Read the workflow YAML file as a string."""
+    """Read the workflow YAML file as a string.
+
+    Read on every trigger (the file is small) so edits are picked up
+    without restarting the app.
+    """
     return WORKFLOW_YAML_PATH.read_text(encoding="utf-8")
 
 
+@st.cache_resource(show_spinner=False)
+def register_workflow(yaml_sha256: str, _workflow_yaml: str) -> str:
+    """Update the workflow stored under WORKFLOW_ID to the local YAML.
+
+    Cached on the YAML's hash, so each version of the file is pushed once
+    per server process and an edited file is pushed on the next trigger.
+    Raises on failure; failures aren't cached, so the push is retried.
+    """
+    resp = get_session().put(
+        f"{KIBANA_URL}/api/workflows/{WORKFLOW_ID}",
+        json={"yaml": _workflow_yaml},
+        timeout=30,
+    )
+    resp.raise_for_status()
+    return yaml_sha256
+
+
 def trigger_workflow(topic: str) -> str:
-    """Trigger the Research Review Loop workflow and return the execution ID."""
-    url = f"{KIBANA_URL}/api/workflows/test"
-    payload = {
-        "inputs": {"topic": topic},
-        "workflowId": WORKFLOW_ID,
-        "workflowYaml": load_workflow_yaml(),
-    }
-    resp = requests.post(url, headers=HEADERS, json=payload, timeout=30)
+    """Trigger the Research Review Loop workflow and return the execution ID.
+
+    Makes sure the workflow stored in Kibana under WORKFLOW_ID matches the
+    local YAML, then runs it by ID so only the inputs are sent. If the
+    stored copy can't be updated, or Kibana doesn't know the workflow (404),
+    falls back to the test endpoint, which uploads the YAML with the request.
+    """
+    session = get_session()
+    workflow_yaml = load_workflow_yaml()
+    try:
+        register_workflow(
+            hashlib.sha256(workflow_yaml.encode()).hexdigest(), workflow_yaml
+        )
+    except requests.RequestException:
+        resp = None  # The stored copy may be stale
+    else:
+        resp = session.post(
+            f"{KIBANA_URL}/api/workflows/{WORKFLOW_ID}/run",
+            json={"inputs": {"topic": topic}},
+            timeout=30,
+        )
+    if resp is None or resp.status_code == 404:
+        payload = {
+            "inputs": {"topic": topic},
+            "workflowId": WORKFLOW_ID,
+            "workflowYaml": workflow_yaml,
+        }
+        resp = session.post(f"{KIBANA_URL}/api/workflows/test", json=payload, timeout=30)
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     return data["workflowExecutionId"]
 
 
 def get_execution(execution_id: str) -> dict:
     """Fetch the current state of a workflow execution."""
     url = f"{KIBANA_URL}/api/workflowExecutions/{execution_id}"
-    resp = requests.get(url, headers=HEADERS, timeout=30)
+    resp = get_session().get(url, timeout=30)
+    resp.raise_for_status()
+    return orjson.loads(resp.content)
+
+
+def cancel_execution(execution_id: str) -> None:
+    """Ask Kibana to cancel a running workflow execution."""
+    url = f"{KIBANA_URL}/api/workflowExecutions/{execution_id}/cancel"
+    resp = get_session().post(url, timeout=30)
     resp.raise_for_status()
-    return resp.json()
 
 
-def extract_step_output(execution: dict, step_id: str) -> str | None:
-    """Extract the output from a specific step execution.
+def watch_execution(
+    execution_id: str, events: queue.Queue, stop: threading.Event
+) -> None:
+    """Poll an execution in the background and push state changes onto a queue.
+
+    Kibana has no event stream for workflow executions, so this thread does
+    the polling and the UI just blocks on the queue, waking only when
+    something changed. Pushes ("progress", (status, step_count)) on change,
+    ("error", exc) on a failed poll, and a final ("done", execution).
+
+    Adapts the poll rate to observed progress: every POLL_ACTIVE_INTERVAL
+    while new steps keep completing, doubling (up to POLL_MAX_INTERVAL) once
+    the step count has been stable for POLL_STABLE_ROUNDS polls, e.g. during
+    long LLM-heavy steps. Setting `stop` ends the thread immediately, even
+    mid-wait.
+    """
+    interval = POLL_ACTIVE_INTERVAL
+    last_progress = None
+    last_count = 0
+    stable_rounds = 0
+    while True:
+        if stop.wait(interval):
+            return
+        try:
+            execution = get_execution(execution_id)
+        except Exception as e:
+            events.put(("error", e))
+            continue
+
+        current_status = execution.get("status", "unknown")
+        if current_status in TERMINAL_STATUSES:
+            events.put(("done", execution))
+            return
+
+        step_count = len(execution.get("stepExecutions", []))
+        if step_count > last_count:
+            last_count = step_count
+            stable_rounds = 0
+            interval = POLL_ACTIVE_INTERVAL
+        else:
+            stable_rounds += 1
+            if stable_rounds >= POLL_STABLE_ROUNDS:
+                interval = min(interval * 2, POLL_MAX_INTERVAL)
+
+        progress = (current_status, step_count)
+        if progress != last_progress:
+            last_progress = progress
+            events.put(("progress", progress))
+
+
+def _generic_output(output: str | dict) -> str | None:
+    """Extract text from a step output of unknown type."""
+    if isinstance(output, str):
+        return output
+    return output.get("message") or output.get("content")
+
+
+# Output text extractors chosen once per step at index time, by stepType:
+# console steps return a plain string, ai.agent steps output.message and
+# ai.prompt steps output.content.
+_OUTPUT_EXTRACTORS = {
+    "console": lambda output: output,
+    "ai.agent": lambda output: output.get("message"),
+    "ai.prompt": lambda output: output.get("content"),
+}
+
+
+def _index_steps(execution: dict) -> dict[str, str | None]:
+    """Map stepId -> output text for all stepExecutions in a single pass.
 
     The API returns stepExecutions with:
     - stepId: the step name from the YAML
@@ -65,74 +218,85 @@ def extract_step_output(execution: dict, step_id: str) -> str | None:
     - output: dict with "message" (ai.agent) or "content" (ai.prompt),
               or a plain string (console steps)
 
-    Skip wrapper entries like step_level_timeout.
+    Skip wrapper entries like step_level_timeout and steps without output.
+    The first matching entry for a stepId wins.
     """
+    index: dict[str, str | None] = {}
     for step in execution.get("stepExecutions", []):
-        if step.get("stepId") != step_id:
-            continue
+        step_type = step.get("stepType")
         # Skip timeout wrappers — they don't have the actual output
-        if step.get("stepType") == "step_level_timeout":
+        if step_type == "step_level_timeout":
             continue
-
         output = step.get("output")
         if output is None:
             continue
+        step_id = step.get("stepId")
+        if step_id not in index:
+            extract = _OUTPUT_EXTRACTORS.get(step_type, _generic_output)
+            index[step_id] = extract(output)
+    return index
 
-        # Console steps return output as a plain string
-        if isinstance(output, str):
-            return output
-
-        # ai.agent steps: output.message
-        # ai.prompt steps: output.content
-        return output.get("message") or output.get("content")
 
-    return None
+def extract_step_output(index: dict[str, str | None], step_id: str) -> str | None:
+    """Return the output text of a step from an index built by _index_steps."""
+    return index.get(step_id)
 
 
-def find_final_report(execution: dict) -> tuple[str | None, str | None, str | None]:
+def find_final_report(index: dict[str, str | None]) -> tuple[str | None, str | None, str | None]:
     """
-    Find the best available report and review from the execution.
+    Find the best available report and review from an indexed execution.
     Checks v3 -> v2 -> v1 to get the most revised version.
     Returns (report, review, verdict_info).
     """
-    # Check iteration 3
-    report = extract_step_output(execution, "researcher_draft_v3")
-    if report:
-        review = extract_step_output(execution, "review_v3")
-        return report, review, "Iteration 3 (final revision)"
-
-    # Check iteration 2
-    report = extract_step_output(execution, "researcher_draft_v2")
-    if report:
-        review = extract_step_output(execution, "review_v2")
-        verdict = extract_step_output(execution, "parse_verdict_v2")
-        return report, review, f"Iteration 2 (verdict: {verdict or 'unknown'})"
-
-    # Check iteration 1
-    report = extract_step_output(execution, "researcher_draft_v1")
-    if report:
-        review = extract_step_output(execution, "review_v1")
-        verdict = extract_step_output(execution, "parse_verdict_v1")
-        return report, review, f"Iteration 1 (verdict: {verdict or 'unknown'})"
+    # The index keys are the set of steps that ran, so membership alone picks
+    # the latest iteration — only that iteration's outputs are extracted.
+    for version, draft_id, review_id, verdict_id in ITERATIONS:
+        if draft_id not in index:
+            continue
+        report = extract_step_output(index, draft_id)
+        if not report:
+            continue
+        review = extract_step_output(index, review_id)
+        if version == FINAL_ITERATION:
+            return report, review, f"Iteration {version} (final revision)"
+        verdict = extract_step_output(index, verdict_id)
+        return report, review, f"Iteration {version} (verdict: {verdict or 'unknown'})"
 
     return None, None, None
 
 
-def get_iteration_summary(execution: dict) -> list[str]:
+def get_iteration_summary(index: dict[str, str | None]) -> list[str]:
     """Build a summary of which iterations ran and their verdicts."""
     summary = []
-    v1 = extract_step_output(execution, "parse_verdict_v1")
-    if v1:
-        summary.append(f"Iteration 1: {v1}")
-    v2 = extract_step_output(execution, "parse_verdict_v2")
-    if v2:
-        summary.append(f"Iteration 2: {v2}")
-    v3_review = extract_step_output(execution, "review_v3")
-    if v3_review:
-        summary.append("Iteration 3: Final review completed")
+    for version, _, review_id, verdict_id in reversed(ITERATIONS):
+        if version == FINAL_ITERATION:
+            # The final iteration has no verdict step, only a closing review
+            if extract_step_output(index, review_id):
+                summary.append(f"Iteration {version}: Final review completed")
+        else:
+            verdict = extract_step_output(index, verdict_id)
+            if verdict:
+                summary.append(f"Iteration {version}: {verdict}")
     return summary
 
 
+@st.cache_data(ttl=3600, show_spinner=False)
+def parse_execution(execution_id: str, execution_json: str) -> dict:
+    """Extract report, review and iteration summary from a finished execution.
+
+    Cached on the execution ID and its serialized body, so Streamlit reruns
+    (expander toggles etc.) don't re-scan stepExecutions every time.
+    """
+    index = _index_steps(json.loads(execution_json))
+    report, review, iteration_info = find_final_report(index)
+    return {
+        "report": report,
+        "review": review,
+        "iteration_info": iteration_info,
+        "iterations": get_iteration_summary(index),
+    }
+
+
 # ── Streamlit UI ──────────────────────────────────────────────────────────────
 
 st.set_page_config(page_title="Research Review Agent", page_icon="📚", layout="wide")
@@ -149,7 +313,24 @@ topic = st.text_area(
     height=80,
 )
 
-if st.button("Run Literature Review", type="primary", disabled=not topic.strip()):
+# Any rerun interrupts an in-progress wait loop, so stop its watcher thread.
+watch_stop = st.session_state.pop("watch_stop", None)
+if watch_stop is not None:
+    watch_stop.set()
+
+run_clicked = st.button("Run Literature Review", type="primary", disabled=not topic.strip())
+
+if st.button("Cancel"):
+    active_id = st.session_state.pop("active_execution_id", None)
+    if active_id:
+        try:
+            cancel_execution(active_id)
+            st.info(f"Cancelled workflow execution `{active_id}`.")
+        except Exception as e:
+            st.warning(f"Failed to cancel workflow: {e}")
+
+if run_clicked:
+    st.session_state.pop("last_parsed", None)
     with st.status("Running multi-agent workflow...", expanded=True) as status:
         # 1. Trigger
         st.write("Triggering Research Review Loop workflow...")
@@ -164,22 +345,42 @@ if st.button("Run Literature Review", type="primary", disabled=not topic.strip()
 
         st.write(f"Execution ID: `{execution_id}`")
 
-        # 2. Poll until complete
+        # 2. Wait for completion; a background thread polls and reports changes
         st.write("Waiting for workflow to complete...")
+        st.session_state["active_execution_id"] = execution_id
+        stop = st.session_state["watch_stop"] = threading.Event()
+        events: queue.Queue = queue.Queue()
+        progress_slot = st.empty()
+        threading.Thread(
+            target=watch_execution, args=(execution_id, events, stop), daemon=True
+        ).start()
+        started = time.monotonic()
+        progress_line = "**Status:** waiting for first update"
         while True:
-            time.sleep(POLL_INTERVAL)
             try:
-                execution = get_execution(execution_id)
-            except Exception as e:
-                st.warning(f"Poll error (retrying): {e}")
-                continue
+                kind, payload = events.get(timeout=1)
+            except queue.Empty:
+                kind = None
+
+            if kind == "error":
+                st.warning(f"Poll error (retrying): {payload}")
+            elif kind == "progress":
+                current_status, step_count = payload
+                progress_line = (
+                    f"**Status:** {current_status} — {step_count} steps completed"
+                )
+            elif kind == "done":
+                execution = payload
+                current_status = execution.get("status", "unknown")
+                break
 
-            current_status = execution.get("status", "unknown")
-            step_count = len(execution.get("stepExecutions", []))
-            st.write(f"Status: **{current_status}** — {step_count} steps completed")
+            # Redraw on every wake-up, even with no news: Streamlit only acts
+            # on a pending rerun (e.g. a Cancel click) during an st.* call
+            elapsed = int(time.monotonic() - started)
+            progress_slot.markdown(f"{progress_line} ({elapsed}s elapsed)")
 
-            if current_status in ("completed", "failed", "error"):
-                break
+        st.session_state.pop("active_execution_id", None)
+        st.session_state.pop("watch_stop", None)
 
         if current_status != "completed":
             status.update(label="Workflow failed", state="error")
@@ -190,9 +391,20 @@ if st.button("Run Literature Review", type="primary", disabled=not topic.strip()
 
         status.update(label="Workflow complete!", state="complete")
 
-    # 3. Extract results
-    report, review, iteration_info = find_final_report(execution)
-    iterations = get_iteration_summary(execution)
+    # 3. Extract results and keep them in session state, so expander toggles
+    # and other reruns re-render them instead of losing them
+    st.session_state["last_execution"] = execution
+    st.session_state["last_parsed"] = parse_execution(
+        execution_id, json.dumps(execution, sort_keys=True)
+    )
+
+if "last_parsed" in st.session_state:
+    execution = st.session_state["last_execution"]
+    parsed = st.session_state["last_parsed"]
+    report = parsed["report"]
+    review = parsed["review"]
+    iteration_info = parsed["iteration_info"]
+    iterations = parsed["iterations"]
 
     # 4. Display iteration info
     if iterations:
@@ -1,7 +1,11 @@
+import functools
 import os
 import sys
+
+import orjson
 from dotenv import load_dotenv
-from elasticsearch import Elasticsearch
+from elasticsearch import Elasticsearch, SerializationError
+from elasticsearch.serializer import JSONSerializer
 
 load_dotenv()
 
@@ -10,20 +14,62 @@ ELASTIC_API_KEY = os.getenv("ELASTIC_API_KEY")
 ELASTIC_ENDPOINT = os.getenv("ELASTIC_ENDPOINT")
 EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
 PAPERS_PDF_DIR = os.getenv("PAPERS_PDF_DIR")
+BULK_THREAD_COUNT = int(os.getenv("BULK_THREAD_COUNT", "4"))
+
+# Keep enough pooled connections per node for every parallel_bulk worker
+# and concurrent evaluation thread.
+CONNECTIONS_PER_NODE = max(32, BULK_THREAD_COUNT)
+
 
+class OrjsonSerializer(JSONSerializer):
+    """JSON serializer backed by orjson.
+
+    Encodes numpy arrays natively, so embeddings can be indexed without
+    converting them to Python lists first.
+    """
+
+    def dumps(self, data):
+        if isinstance(data, str):
+            return data.encode("utf-8", "surrogatepass")
+        if isinstance(data, bytes):
+            return data
+        return orjson.dumps(
+            data, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY
+        )
 
+    def loads(self, data):
+        # Same contract as the base class: an empty JSON-labeled body is None
+        # and undecodable bodies raise SerializationError.
+        if data == b"":
+            return None
+        try:
+            return orjson.loads(data)
+        except (ValueError, TypeError) as e:
+            raise SerializationError(
+                message=f"Unable to deserialize as JSON: {data!r}", errors=(e,)
+            )
+
+
+@functools.lru_cache(maxsize=1)
 def get_es_client():
-    """Create and return an Elasticsearch client."""
+    """Create and return the process-wide Elasticsearch client.
+
+    The client is built once and reused, so callers share one connection pool.
+    Request bodies are gzip-compressed, and timed-out requests are retried.
+    """
+    options = {
+        "api_key": ELASTIC_API_KEY,
+        "connections_per_node": CONNECTIONS_PER_NODE,
+        "http_compress": True,
+        "request_timeout": 60,
+        "retry_on_timeout": True,
+        "max_retries": 3,
+        "serializer": OrjsonSerializer(),
+    }
     if ELASTIC_ENDPOINT and ELASTIC_ENDPOINT != "your_endpoint_url_here":
-        return Elasticsearch(
-            ELASTIC_ENDPOINT,
-            api_key=ELASTIC_API_KEY,
-        )
+        return Elasticsearch(ELASTIC_ENDPOINT, **options)
     if ELASTIC_CLOUD_ID and ELASTIC_CLOUD_ID != "your_cloud_id_here":
-        return Elasticsearch(
-            cloud_id=ELASTIC_CLOUD_ID,
-            api_key=ELASTIC_API_KEY,
-        )
+        return Elasticsearch(cloud_id=ELASTIC_CLOUD_ID, **options)
     print("Error: Set ELASTIC_ENDPOINT or ELASTIC_CLOUD_ID in .env")
     sys.exit(1)
 
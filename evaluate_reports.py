@@ -6,16 +6,88 @@ confidence tag distribution, and report statistics.
 """
 
 import argparse
-import json
+import bisect
+import functools
+import io
 import os
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import orjson
 
 from config import get_es_client
 
 REPORTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports")
 METADATA_INDEX = "papers_metadata"
 CHUNKS_INDEX = "papers_chunks"
+EVAL_WORKERS = int(os.environ.get("EVAL_WORKERS", "8"))
+# Verification only reads hit totals and the top score. Combined with
+# "_source": false this keeps stored documents (and their dense vectors)
+# out of every response.
+MSEARCH_FILTER_PATH = [
+    "responses.error",
+    "responses.hits.total.value",
+    "responses.hits.hits._score",
+]
+
+# Precompiled patterns — compiled once at import rather than per call.
+REFERENCES_HEADER_RE = re.compile(
+    r"^(?:#{0,3}\s*)?(?:\d+\.\s*)?References\s*$",
+    re.MULTILINE | re.IGNORECASE,
+)
+BLANK_LINE_RE = re.compile(r"\n\s*\n")
+# One pass over a reference block picks up both fields:
+#   pid   — *Paper ID: <hash>*   or   paper_id: <hash>
+#   title — the text after "(<year>). " up to the next period or Paper ID
+#           marker; captured inside a lookahead so the scan can still find
+#           a pid within it
+REFERENCE_FIELDS_RE = re.compile(
+    r"(?:\*\s*)?[Pp]aper[\s_][Ii][Dd][:\s]+(?P<pid>[a-f0-9]{20,})(?:\s*\*)?"
+    r"|\(\d{4}\)\.\s*"
+    r"(?=(?P<title>.+?)(?:\.\s*(?:\*?\s*[Pp]aper|paper_id)|$))",
+    re.DOTALL,
+)
+SENTENCE_SPLIT_RE = re.compile(r"\.\s")
+LEADING_NUMBER_RE = re.compile(r"^\d+\.\s*")
+
+# All quantitative-claim forms as one alternation, so the body is scanned once
+CLAIM_RE = re.compile(
+    r"(?P<verb>(?:achieved|showed|demonstrated|found|reported|reduced|improved)\s+.*?\d+\.?\d*\s*%)"
+    r"|(?P<cmp>\b\d+\.?\d+\s+(?:vs|versus)\s+\d+\.?\d+)"  # comparisons: 94.8 vs 93.4
+    r"|(?P<pct>\d+\.?\d*\s*%)"              # percentages: 26.1%, 96%
+    r"|(?P<mul>\d+\.?\d*\s*×)"              # multipliers: 28×, 2.12×
+    r"|(?P<xcmp>\d+\.?\d*x\s+(?:more|reduction|improvement|faster|slower))"
+    r"|(?P<count>\b\d{2,}(?:,\d{3})*\s+(?:papers?|citations?|attacks?|skills?|scenarios?|agents?|CVEs?|users?))"
+    r"|(?P<usd>\$\d+\.?\d*)"                # dollar amounts
+    r"|(?P<odds>OR\s*=\s*\d+\.?\d*)"        # odds ratios
+    r"|(?P<pval>p\s*<\s*0\.\d+)",           # p-values
+    re.IGNORECASE,
+)
+WHITESPACE_RE = re.compile(r"\s+")
+WORD_RE = re.compile(r"\S+")
+NON_ALPHA_RE = re.compile(r"[^a-zA-Z\s]")
+
+CONFIDENCE_TAGS = ("[SUPPORTED]", "[CONTESTED]", "[INSUFFICIENT]")
+# Unbracketed form at start of line or after whitespace: SUPPORTED:
+# The lookarounds skip the bracketed form, which is counted separately.
+UNBRACKETED_TAG_RE = re.compile(
+    r"(?<!\[)\b(SUPPORTED|CONTESTED|INSUFFICIENT)\b(?!\])"
+)
+
+MARKDOWN_NUMBERED_HEADER_RE = re.compile(r"^#{2}\s+\d+\.", re.MULTILINE)
+# Markdown report: ## headers (with or without numbers)
+MARKDOWN_SECTION_RE = re.compile(r"^#{2}\s+(?:\d+\.\s+)?\S.+$", re.MULTILINE)
+# Plain text report: 'N. Title' lines that aren't sub-sections (no X.Y
+# numbering) and don't contain bold markdown (**)
+PLAIN_SECTION_RE = re.compile(r"^(\d+)\.\s+[A-Z][^*\n]+$", re.MULTILINE)
+
+NEXT_SECTION_RE = re.compile(
+    r"^(?:#{2,3}\s+\d*\.?\s*[A-Z]|\d+\.\s+[A-Z])", re.MULTILINE
+)
+SUBSECTION_RE = re.compile(r"^(?:#{3,4}\s+)?\d+\.\d+\s+.+$", re.MULTILINE)
+LIST_ITEM_RE = re.compile(r"^\s*[-•*]\s+.+$|^\s*\d+\.\s+.+$", re.MULTILINE)
 
 
 # ---------------------------------------------------------------------------
@@ -34,11 +106,7 @@ def split_references_section(text):
     Returns (body, references_text). If no references section is found,
     references_text is an empty string.
     """
-    pattern = re.compile(
-        r"^(?:#{0,3}\s*)?(?:\d+\.\s*)?References\s*$",
-        re.MULTILINE | re.IGNORECASE,
-    )
-    match = pattern.search(text)
+    match = REFERENCES_HEADER_RE.search(text)
     if match:
         return text[: match.start()], text[match.start():]
     return text, ""
@@ -56,7 +124,7 @@ def parse_references(references_text):
     # Skip the header line itself
     content_lines = []
     for line in lines:
-        if re.match(r"^(?:#{0,3}\s*)?(?:\d+\.\s*)?References\s*$", line, re.IGNORECASE):
+        if REFERENCES_HEADER_RE.match(line):
             continue
         content_lines.append(line)
 
@@ -64,7 +132,7 @@ def parse_references(references_text):
     # References are separated by blank lines or start with a number.
     joined = "\n".join(content_lines).strip()
     # Split on blank-line boundaries that precede a new reference
-    ref_blocks = re.split(r"\n\s*\n", joined)
+    ref_blocks = BLANK_LINE_RE.split(joined)
 
     refs = []
     for block in ref_blocks:
@@ -75,34 +143,29 @@ def parse_references(references_text):
         paper_id = None
         title = None
 
-        # Extract paper_id — two known formats:
-        #   *Paper ID: <hash>*   or   paper_id: <hash>
-        pid_match = re.search(
-            r"(?:\*\s*)?[Pp]aper[\s_][Ii][Dd][:\s]+([a-f0-9]{20,})(?:\s*\*)?",
-            block,
-        )
-        if pid_match:
-            paper_id = pid_match.group(1).strip()
-
-        # Extract title — look for italicized title (*Title*) or the text
-        # after "(<year>). " up to the next period or Paper ID marker.
-        title_match = re.search(
-            r"\(\d{4}\)\.\s*(.+?)(?:\.\s*(?:\*?\s*[Pp]aper|paper_id)|$)",
-            block,
-            re.DOTALL,
-        )
-        if title_match:
-            candidate = title_match.group(1).strip().rstrip(".")
-            # Remove markdown italics
-            candidate = candidate.replace("*", "").strip()
-            if len(candidate) > 10:
-                title = candidate
+        # Extract paper_id and title in a single scan; the first match of
+        # each kind wins.
+        title_seen = False
+        for match in REFERENCE_FIELDS_RE.finditer(block):
+            pid = match.group("pid")
+            if pid is not None:
+                if paper_id is None:
+                    paper_id = pid.strip()
+            elif not title_seen:
+                title_seen = True
+                candidate = match.group("title").strip().rstrip(".")
+                # Remove markdown italics
+                candidate = candidate.replace("*", "").strip()
+                if len(candidate) > 10:
+                    title = candidate
+            if paper_id is not None and title_seen:
+                break
 
         # Fallback: grab first substantial sentence as title
         if not title:
-            sentences = re.split(r"\.\s", block)
+            sentences = SENTENCE_SPLIT_RE.split(block)
             for s in sentences:
-                clean = re.sub(r"^\d+\.\s*", "", s).strip()
+                clean = LEADING_NUMBER_RE.sub("", s).strip()
                 clean = clean.replace("*", "").strip()
                 if len(clean) > 15 and "paper_id" not in clean.lower():
                     title = clean
@@ -120,34 +183,21 @@ def extract_quantitative_claims(body_text):
     decimal numbers in context. Returns list of {claim, context}.
     """
     claims = []
-    seen_contexts = set()
-
-    patterns = [
-        r"\d+\.?\d*\s*%",             # percentages: 26.1%, 96%
-        r"\d+\.?\d*\s*×",             # multipliers: 28×, 2.12×
-        r"\d+\.?\d*x\s+(?:more|reduction|improvement|faster|slower)",
-        r"\b\d{2,}(?:,\d{3})*\s+(?:papers?|citations?|attacks?|skills?|scenarios?|agents?|CVEs?|users?)",
-        r"\b\d+\.?\d+\s+(?:vs|versus)\s+\d+\.?\d+",  # comparisons: 94.8% vs 93.4%
-        r"(?:achieved|showed|demonstrated|found|reported|reduced|improved)\s+.*?\d+\.?\d*\s*%",
-        r"\$\d+\.?\d*",               # dollar amounts
-        r"OR\s*=\s*\d+\.?\d*",        # odds ratios
-        r"p\s*<\s*0\.\d+",            # p-values
-    ]
+    seen = set()
+
+    for match in CLAIM_RE.finditer(body_text):
+        claim_text = match.group(0).strip()
+        # Deduplicate the same claim repeated within a ~200-char window
+        dedup_key = (claim_text, match.start() // 200)
+        if dedup_key in seen:
+            continue
+        seen.add(dedup_key)
 
-    for pattern in patterns:
-        for match in re.finditer(pattern, body_text, re.IGNORECASE):
-            start = max(0, match.start() - 120)
-            end = min(len(body_text), match.end() + 120)
-            context = body_text[start:end].strip()
-            # Normalize whitespace
-            context = re.sub(r"\s+", " ", context)
-
-            # Deduplicate overlapping contexts
-            claim_text = match.group(0).strip()
-            dedup_key = claim_text + context[len(context) // 3: 2 * len(context) // 3]
-            if dedup_key not in seen_contexts:
-                seen_contexts.add(dedup_key)
-                claims.append({"claim": claim_text, "context": context})
+        start = max(0, match.start() - 120)
+        end = min(len(body_text), match.end() + 120)
+        # Normalize whitespace
+        context = WHITESPACE_RE.sub(" ", body_text[start:end].strip())
+        claims.append({"claim": claim_text, "context": context})
 
     return claims
 
@@ -155,7 +205,7 @@ def extract_quantitative_claims(body_text):
 def extract_context_words(context, n=10):
     """Extract ~n meaningful words around a quantitative claim for search."""
     # Remove numbers/symbols to focus on descriptive words
-    cleaned = re.sub(r"[^a-zA-Z\s]", " ", context)
+    cleaned = NON_ALPHA_RE.sub(" ", context)
     words = [w for w in cleaned.split() if len(w) > 2]
     # Take words from the middle of the context for best relevance
     mid = len(words) // 2
@@ -168,24 +218,13 @@ def count_confidence_tags(text):
 
     Handles both bracketed ([SUPPORTED]) and unbracketed (SUPPORTED:) formats.
     """
-    tags = {
-        "[SUPPORTED]": 0,
-        "[CONTESTED]": 0,
-        "[INSUFFICIENT]": 0,
+    unbracketed = Counter(
+        m.group(1) for m in UNBRACKETED_TAG_RE.finditer(text)
+    )
+    return {
+        tag: text.count(tag) + unbracketed[tag.strip("[]")]
+        for tag in CONFIDENCE_TAGS
     }
-    for tag in tags:
-        keyword = tag.strip("[]")
-        # Count bracketed form: [SUPPORTED]
-        bracketed = len(re.findall(re.escape(tag), text))
-        # Count unbracketed form at start of line or after whitespace: SUPPORTED:
-        unbracketed = len(re.findall(
-            r"(?<!\[)\b" + keyword + r"\b(?!\])",
-            text,
-        ))
-        # Avoid double-counting: unbracketed matches also fire on "[SUPPORTED]"
-        # so subtract bracketed from unbracketed
-        tags[tag] = bracketed + max(0, unbracketed - bracketed)
-    return tags
 
 
 def count_sections(text):
@@ -194,53 +233,62 @@ def count_sections(text):
     Counts top-level sections: '## N. Title' markdown headers, or plain
     'N. Title' lines that look like section headers (not numbered list items).
     """
-    has_markdown_headers = bool(re.search(r"^#{2}\s+\d+\.", text, re.MULTILINE))
-
-    if has_markdown_headers:
-        # Markdown report: count ## headers (with or without numbers)
-        pattern = r"^#{2}\s+(?:\d+\.\s+)?\S.+$"
+    if MARKDOWN_NUMBERED_HEADER_RE.search(text):
+        pattern = MARKDOWN_SECTION_RE
     else:
-        # Plain text report: count 'N. Title' lines that aren't sub-sections
-        # (no X.Y numbering) and don't contain bold markdown (**)
-        pattern = r"^(\d+)\.\s+[A-Z][^*\n]+$"
+        pattern = PLAIN_SECTION_RE
 
-    return len(re.findall(pattern, text, re.MULTILINE))
+    return len(pattern.findall(text))
 
 
-def count_section_items(text, section_name):
-    """Count bullet points or numbered items in a named section."""
-    # Find the section
-    pattern = re.compile(
+@functools.lru_cache(maxsize=None)
+def _section_header_re(section_name):
+    """Compile (once per section name) the pattern locating a section header."""
+    return re.compile(
         r"^(?:#{0,3}\s*)?(?:\d+\.?\s*)?.*?" + re.escape(section_name) + r".*$",
         re.MULTILINE | re.IGNORECASE,
     )
-    match = pattern.search(text)
-    if not match:
-        return 0
 
-    # Find the next top-level section after this one
-    section_start = match.end()
-    next_section = re.search(
-        r"^(?:#{2,3}\s+\d*\.?\s*[A-Z]|\d+\.\s+[A-Z])",
-        text[section_start:],
-        re.MULTILINE,
-    )
-    if next_section:
-        section_text = text[section_start: section_start + next_section.start()]
-    else:
-        section_text = text[section_start:]
+
+def _section_spans(text, section_names):
+    """Locate the body of each named section: {name: (start, end)}.
+
+    Section boundaries come from a single NEXT_SECTION_RE scan shared by all
+    names; sections that aren't found are omitted.
+    """
+    boundaries = [m.start() for m in NEXT_SECTION_RE.finditer(text)]
+    spans = {}
+    for name in section_names:
+        match = _section_header_re(name).search(text)
+        if not match:
+            continue
+        # The body runs to the next top-level section after the header
+        start = match.end()
+        i = bisect.bisect_left(boundaries, start)
+        end = boundaries[i] if i < len(boundaries) else len(text)
+        spans[name] = (start, end)
+    return spans
+
+
+def count_section_items(text, section_name, spans=None):
+    """Count bullet points or numbered items in a named section.
+
+    spans may be a precomputed _section_spans() result covering section_name.
+    """
+    if spans is None:
+        spans = _section_spans(text, (section_name,))
+    if section_name not in spans:
+        return 0
+    start, end = spans[section_name]
+    section_text = text[start:end]
 
     # Count sub-sections (### X.Y or X.Y Title patterns) as items
-    subsection_matches = re.findall(
-        r"^(?:#{3,4}\s+)?\d+\.\d+\s+.+$",
-        section_text,
-        re.MULTILINE,
-    )
+    subsection_matches = SUBSECTION_RE.findall(section_text)
     if subsection_matches:
         return len(subsection_matches)
 
     # Fallback: count bullet points or numbered items
-    items = re.findall(r"^\s*[-•*]\s+.+$|^\s*\d+\.\s+.+$", section_text, re.MULTILINE)
+    items = LIST_ITEM_RE.findall(section_text)
     return len(items)
 
 
@@ -253,56 +301,146 @@ def extract_paper_ids_from_references(refs):
 # Elasticsearch verification
 # ---------------------------------------------------------------------------
 
-def verify_citation_by_paper_id(es, paper_id):
-    """Check if a paper_id exists in papers_metadata. Returns True/False."""
-    try:
-        result = es.search(
-            index=METADATA_INDEX,
-            body={"query": {"term": {"paper_id": paper_id}}, "size": 1},
-        )
-        return result["hits"]["total"]["value"] > 0
-    except Exception as e:
-        print(f"    [ERROR] paper_id lookup failed: {e}")
-        return False
+# Verification results keyed by query string. References and claim contexts
+# recur across reports in an --all run, so each is only sent to ES once.
+_PAPER_ID_CACHE = {}
+_TITLE_CACHE = {}
+_CLAIM_CACHE = {}
 
 
-def verify_citation_by_title(es, title):
-    """Search for a title in papers_metadata. Returns True/False."""
+def _msearch(es, index, bodies):
+    """Run a list of query bodies as a single _msearch request.
+
+    Returns one response per body, in order. Sub-searches that failed (or
+    all of them, if the request itself failed) come back as None.
+    """
+    if not bodies:
+        return []
+    searches = []
+    for body in bodies:
+        searches.append({})
+        searches.append(body)
     try:
-        result = es.search(
-            index=METADATA_INDEX,
-            body={"query": {"match": {"title": title}}, "size": 1},
+        result = es.msearch(
+            index=index, body=searches, filter_path=MSEARCH_FILTER_PATH
         )
-        if result["hits"]["total"]["value"] > 0:
-            score = result["hits"]["hits"][0]["_score"]
-            return score > 5.0  # threshold for meaningful match
-        return False
     except Exception as e:
-        print(f"    [ERROR] title lookup failed: {e}")
-        return False
+        print(f"    [ERROR] msearch on {index} failed: {e}")
+        return [None] * len(bodies)
+
+    responses = []
+    for response in result["responses"]:
+        if "error" in response:
+            print(f"    [ERROR] {index} lookup failed: {response['error']}")
+            responses.append(None)
+        else:
+            responses.append(response)
+    return responses
 
 
-def verify_claim_in_corpus(es, context_words):
-    """Search papers_chunks for text matching the claim context."""
-    try:
-        result = es.search(
-            index=CHUNKS_INDEX,
-            body={"query": {"match": {"chunk_text": context_words}}, "size": 1},
-        )
-        if result["hits"]["total"]["value"] > 0:
-            score = result["hits"]["hits"][0]["_score"]
-            return score > 8.0  # threshold for meaningful match
-        return False
-    except Exception as e:
-        print(f"    [ERROR] claim lookup failed: {e}")
+def _top_score_above(response, threshold):
+    """True if a search response has a top hit scoring above threshold."""
+    if not response or response["hits"]["total"]["value"] == 0:
         return False
+    return response["hits"]["hits"][0]["_score"] > threshold
+
+
+def _resolve_cached(cache, keys, lookup):
+    """Resolve keys through a verification cache, querying only the misses.
+
+    lookup receives the unique uncached keys and returns one result per key;
+    None marks a failed lookup, which is left uncached so it gets retried.
+    """
+    missing = list(dict.fromkeys(k for k in keys if k not in cache))
+    if missing:
+        for key, result in zip(missing, lookup(missing)):
+            if result is not None:
+                cache[key] = result
+    return [cache.get(k) for k in keys]
+
+
+def verify_citations_bulk(es, refs):
+    """Verify all references against papers_metadata with two _msearch calls.
+
+    References with a paper_id are looked up by exact paper_id first; those
+    not found (and those without a paper_id) fall back to a title match.
+    Returns one entry per ref: "paper_id", "title", or None if not found.
+    """
+    statuses = [None] * len(refs)
+
+    def lookup_ids(paper_ids):
+        responses = _msearch(es, METADATA_INDEX, [
+            {"query": {"term": {"paper_id": pid}}, "size": 1, "_source": False}
+            for pid in paper_ids
+        ])
+        return [
+            None if response is None else response["hits"]["total"]["value"] > 0
+            for response in responses
+        ]
+
+    def lookup_titles(titles):
+        responses = _msearch(es, METADATA_INDEX, [
+            {"query": {"match": {"title": title}}, "size": 1, "_source": False}
+            for title in titles
+        ])
+        # threshold for meaningful match
+        return [
+            None if response is None else _top_score_above(response, 5.0)
+            for response in responses
+        ]
+
+    # Batch 1: exact paper_id lookups
+    by_id = [i for i, ref in enumerate(refs) if ref["paper_id"]]
+    found = _resolve_cached(
+        _PAPER_ID_CACHE, [refs[i]["paper_id"] for i in by_id], lookup_ids
+    )
+    for i, ok in zip(by_id, found):
+        if ok:
+            statuses[i] = "paper_id"
+
+    # Batch 2: title fallback for everything still unverified
+    by_title = [i for i, ref in enumerate(refs) if statuses[i] is None and ref["title"]]
+    found = _resolve_cached(
+        _TITLE_CACHE, [refs[i]["title"] for i in by_title], lookup_titles
+    )
+    for i, ok in zip(by_title, found):
+        if ok:
+            statuses[i] = "title"
+
+    return statuses
+
+
+def verify_claims_bulk(es, context_words_list):
+    """Search papers_chunks for each claim context in a single _msearch.
+
+    Returns one bool per context: whether the corpus has a matching chunk.
+    """
+    def lookup(contexts):
+        responses = _msearch(es, CHUNKS_INDEX, [
+            {"query": {"match": {"chunk_text": words}}, "size": 1, "_source": False}
+            for words in contexts
+        ])
+        # threshold for meaningful match
+        return [
+            None if response is None else _top_score_above(response, 8.0)
+            for response in responses
+        ]
+
+    return [
+        bool(ok)
+        for ok in _resolve_cached(_CLAIM_CACHE, context_words_list, lookup)
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _corpus_count(es):
+    return es.count(index=METADATA_INDEX, filter_path=["count"])["count"]
 
 
 def get_total_corpus_papers(es):
-    """Get total paper count from papers_metadata."""
+    """Get total paper count from papers_metadata (cached for the run)."""
     try:
-        result = es.count(index=METADATA_INDEX)
-        return result["count"]
+        return _corpus_count(es)
     except Exception as e:
         print(f"  [ERROR] corpus count failed: {e}")
         return 0
@@ -313,75 +451,73 @@ def get_total_corpus_papers(es):
 # ---------------------------------------------------------------------------
 
 def evaluate_report(filepath, es):
-    """Run all evaluations on a single report file."""
+    """Run all evaluations on a single report file.
+
+    Output is buffered and written in one go at the end, so reports evaluated
+    concurrently don't interleave their lines.
+    """
+    out = io.StringIO()
+    log = functools.partial(print, file=out)
+
     filename = os.path.basename(filepath)
     text = read_report(filepath)
     body, refs_text = split_references_section(text)
     refs = parse_references(refs_text)
 
-    print(f"\n{'=' * 54}")
-    print(f"  EVALUATION: {filename}")
-    print(f"{'=' * 54}")
+    log(f"\n{'=' * 54}")
+    log(f"  EVALUATION: {filename}")
+    log(f"{'=' * 54}")
 
     # --- 1. Citation Verification ---
-    print("\n  Checking citations...")
+    log("\n  Checking citations...")
     verified_by_id = 0
     verified_by_title = 0
     not_found = 0
     hallucinated = []
 
-    for i, ref in enumerate(refs, 1):
+    statuses = verify_citations_bulk(es, refs)
+    for i, (ref, status) in enumerate(zip(refs, statuses), 1):
         label = ref["title"][:50] if ref["title"] else ref["raw"][:50]
-        if ref["paper_id"]:
-            if verify_citation_by_paper_id(es, ref["paper_id"]):
-                verified_by_id += 1
-                print(f"    [{i}/{len(refs)}] ID verified: {label}...")
-            else:
-                # Fallback to title
-                if ref["title"] and verify_citation_by_title(es, ref["title"]):
-                    verified_by_title += 1
-                    print(f"    [{i}/{len(refs)}] Title matched: {label}...")
-                else:
-                    not_found += 1
-                    hallucinated.append(ref["raw"][:100])
-                    print(f"    [{i}/{len(refs)}] NOT FOUND: {label}...")
-        elif ref["title"]:
-            if verify_citation_by_title(es, ref["title"]):
-                verified_by_title += 1
-                print(f"    [{i}/{len(refs)}] Title matched: {label}...")
-            else:
-                not_found += 1
-                hallucinated.append(ref["raw"][:100])
-                print(f"    [{i}/{len(refs)}] NOT FOUND: {label}...")
+        if status == "paper_id":
+            verified_by_id += 1
+            log(f"    [{i}/{len(refs)}] ID verified: {label}...")
+        elif status == "title":
+            verified_by_title += 1
+            log(f"    [{i}/{len(refs)}] Title matched: {label}...")
         else:
             not_found += 1
             hallucinated.append(ref["raw"][:100])
-            print(f"    [{i}/{len(refs)}] UNPARSEABLE: {ref['raw'][:50]}...")
+            if ref["paper_id"] or ref["title"]:
+                log(f"    [{i}/{len(refs)}] NOT FOUND: {label}...")
+            else:
+                log(f"    [{i}/{len(refs)}] UNPARSEABLE: {ref['raw'][:50]}...")
 
     total_citations = len(refs)
     verified_total = verified_by_id + verified_by_title
     citation_accuracy = (verified_total / total_citations * 100) if total_citations else 0.0
 
     # --- 2. Claim Grounding ---
-    print("\n  Checking quantitative claims...")
+    log("\n  Checking quantitative claims...")
     claims = extract_quantitative_claims(body)
     grounded = 0
     unverified_claims = []
 
-    for i, claim in enumerate(claims, 1):
-        context_words = extract_context_words(claim["context"])
-        if verify_claim_in_corpus(es, context_words):
+    claim_verified = verify_claims_bulk(
+        es, [extract_context_words(c["context"]) for c in claims]
+    )
+    for i, (claim, verified) in enumerate(zip(claims, claim_verified), 1):
+        if verified:
             grounded += 1
-            print(f"    [{i}/{len(claims)}] Grounded: {claim['claim']}")
+            log(f"    [{i}/{len(claims)}] Grounded: {claim['claim']}")
         else:
             unverified_claims.append(claim["claim"])
-            print(f"    [{i}/{len(claims)}] Unverified: {claim['claim']}")
+            log(f"    [{i}/{len(claims)}] Unverified: {claim['claim']}")
 
     total_claims = len(claims)
     grounding_rate = (grounded / total_claims * 100) if total_claims else 0.0
 
     # --- 3. Corpus Coverage ---
-    print("\n  Checking corpus coverage...")
+    log("\n  Checking corpus coverage...")
     unique_ids = extract_paper_ids_from_references(refs)
     total_corpus = get_total_corpus_papers(es)
     coverage = (len(unique_ids) / total_corpus * 100) if total_corpus else 0.0
@@ -391,49 +527,50 @@ def evaluate_report(filepath, es):
     total_tags = sum(tags.values())
 
     # --- 5. Report Statistics ---
-    word_count = len(text.split())
+    word_count = sum(1 for _ in WORD_RE.finditer(text))
     sections = count_sections(text)
     num_references = len(refs)
-    research_gaps = count_section_items(text, "Research Gaps")
-    contradictions = count_section_items(text, "Contradictions")
+    spans = _section_spans(text, ("Research Gaps", "Contradictions"))
+    research_gaps = count_section_items(text, "Research Gaps", spans)
+    contradictions = count_section_items(text, "Contradictions", spans)
 
     # --- 6. Print summary ---
-    print(f"\n{'=' * 54}")
-    print(f"  EVALUATION: {filename}")
-    print(f"{'=' * 54}")
-
-    print(f"\n  CITATION ACCURACY")
-    print(f"    Total citations:            {total_citations}")
-    print(f"    Verified by paper_id:       {verified_by_id}")
-    print(f"    Verified by title match:    {verified_by_title}")
-    print(f"    Not found:                  {not_found}")
-    print(f"    Citation accuracy:          {citation_accuracy:.1f}%")
-    print(f"    Hallucinated citations:     {not_found}")
-
-    print(f"\n  CLAIM GROUNDING")
-    print(f"    Quantitative claims found:  {total_claims}")
-    print(f"    Verified in corpus:         {grounded}")
-    print(f"    Unverified:                 {total_claims - grounded}")
-    print(f"    Grounding rate:             {grounding_rate:.1f}%")
-
-    print(f"\n  CORPUS COVERAGE")
-    print(f"    Unique papers cited:        {len(unique_ids)}")
-    print(f"    Total papers in corpus:     {total_corpus}")
-    print(f"    Coverage per review:        {coverage:.1f}%")
-
-    print(f"\n  CONFIDENCE DISTRIBUTION")
+    log(f"\n{'=' * 54}")
+    log(f"  EVALUATION: {filename}")
+    log(f"{'=' * 54}")
+
+    log(f"\n  CITATION ACCURACY")
+    log(f"    Total citations:            {total_citations}")
+    log(f"    Verified by paper_id:       {verified_by_id}")
+    log(f"    Verified by title match:    {verified_by_title}")
+    log(f"    Not found:                  {not_found}")
+    log(f"    Citation accuracy:          {citation_accuracy:.1f}%")
+    log(f"    Hallucinated citations:     {not_found}")
+
+    log(f"\n  CLAIM GROUNDING")
+    log(f"    Quantitative claims found:  {total_claims}")
+    log(f"    Verified in corpus:         {grounded}")
+    log(f"    Unverified:                 {total_claims - grounded}")
+    log(f"    Grounding rate:             {grounding_rate:.1f}%")
+
+    log(f"\n  CORPUS COVERAGE")
+    log(f"    Unique papers cited:        {len(unique_ids)}")
+    log(f"    Total papers in corpus:     {total_corpus}")
+    log(f"    Coverage per review:        {coverage:.1f}%")
+
+    log(f"\n  CONFIDENCE DISTRIBUTION")
     for tag, count in tags.items():
         pct = (count / total_tags * 100) if total_tags else 0.0
-        print(f"    {tag}:{' ' * (24 - len(tag))}{count} ({pct:.1f}%)")
+        log(f"    {tag}:{' ' * (24 - len(tag))}{count} ({pct:.1f}%)")
 
-    print(f"\n  REPORT STATISTICS")
-    print(f"    Word count:                 {word_count:,}")
-    print(f"    Sections:                   {sections}")
-    print(f"    References:                 {num_references}")
-    print(f"    Research gaps:              {research_gaps}")
-    print(f"    Contradictions:             {contradictions}")
+    log(f"\n  REPORT STATISTICS")
+    log(f"    Word count:                 {word_count:,}")
+    log(f"    Sections:                   {sections}")
+    log(f"    References:                 {num_references}")
+    log(f"    Research gaps:              {research_gaps}")
+    log(f"    Contradictions:             {contradictions}")
 
-    print(f"\n{'=' * 54}")
+    log(f"\n{'=' * 54}")
 
     # Build results dict
     results = {
@@ -474,9 +611,10 @@ def evaluate_report(filepath, es):
     # Save JSON
     base = os.path.splitext(filename)[0]
     json_path = os.path.join(REPORTS_DIR, f"{base}_eval.json")
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2)
-    print(f"  Results saved to {json_path}")
+    with open(json_path, "wb") as f:
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+    log(f"  Results saved to {json_path}")
+    sys.stdout.write(out.getvalue())
 
     return results
 
@@ -551,20 +689,20 @@ def main():
             sys.exit(1)
         evaluate_report(args.file, es)
     else:
-        txt_files = sorted(
-            f
-            for f in os.listdir(REPORTS_DIR)
-            if f.endswith(".txt") and not f.endswith("_eval.json")
-        )
-        if not txt_files:
+        with os.scandir(REPORTS_DIR) as entries:
+            paths = sorted(
+                entry.path
+                for entry in entries
+                if entry.is_file() and entry.name.endswith(".txt")
+            )
+        if not paths:
             print(f"No .txt report files found in {REPORTS_DIR}")
             sys.exit(1)
 
-        all_results = []
-        for fname in txt_files:
-            fpath = os.path.join(REPORTS_DIR, fname)
-            result = evaluate_report(fpath, es)
-            all_results.append(result)
+        # Each evaluation is network-bound on ES, and the client is threadsafe,
+        # so reports are evaluated concurrently.
+        with ThreadPoolExecutor(max_workers=EVAL_WORKERS) as executor:
+            all_results = list(executor.map(lambda p: evaluate_report(p, es), paths))
 
         print_aggregate(all_results)
 
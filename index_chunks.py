@@ -1,22 +1,48 @@
 """Index parsed text chunks into the papers_chunks Elasticsearch index."""
 
-import json
 import os
 import sys
+from itertools import islice
 
+import orjson
+import torch
 from elasticsearch import helpers
 from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
-from config import EMBEDDING_MODEL, get_es_client
+from config import BULK_THREAD_COUNT, EMBEDDING_MODEL, get_es_client
 
 CHUNKS_PATH = os.path.join(
-    os.path.dirname(os.path.abspath(__file__)), "parsed_chunks.json"
+    os.path.dirname(os.path.abspath(__file__)), "parsed_chunks.jsonl"
 )
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+ENCODE_BATCH_SIZE = 256 if DEVICE == "cuda" else 64
+# Chunks pulled from the stream per encode() call. encode() sorts its input
+# by length before batching, so a wider window yields tighter padding.
+ENCODE_WINDOW = ENCODE_BATCH_SIZE * 8
 
 
-def main():
-    """Load parsed chunks, generate embeddings, and bulk index into ES."""
+def stream_chunks(path=CHUNKS_PATH):
+    """Yield chunk dicts from parsed_chunks.jsonl one line at a time."""
+    with open(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+def batched(iterable, size):
+    """Yield successive lists of up to `size` items from an iterable."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def main(chunks=None):
+    """Stream parsed chunks, generate embeddings, and bulk index into ES.
+
+    chunks is an iterable of chunk dicts; by default they are read from
+    parsed_chunks.jsonl.
+    """
     print("=" * 60)
     print("INDEX CHUNKS")
     print("=" * 60)
@@ -32,48 +58,63 @@ def main():
         print(f"Error: Elasticsearch connection failed: {e}")
         sys.exit(1)
 
-    if not os.path.exists(CHUNKS_PATH):
-        print(f"Error: {CHUNKS_PATH} not found. Run parse_pdfs.py first.")
-        sys.exit(1)
+    if chunks is None:
+        if not os.path.exists(CHUNKS_PATH):
+            print(f"Error: {CHUNKS_PATH} not found. Run parse_pdfs.py first.")
+            sys.exit(1)
+        chunks = stream_chunks()
 
-    with open(CHUNKS_PATH, "r", encoding="utf-8") as f:
-        chunks = json.load(f)
-    print(f"Loaded {len(chunks)} chunks from parsed_chunks.json")
+    # Generate embeddings and index in a streaming pipeline: chunks are read,
+    # encoded and indexed one batch at a time, so memory stays bounded
+    # regardless of corpus size.
+    print(f"Loading embedding model: {EMBEDDING_MODEL} ({DEVICE})")
+    model = SentenceTransformer(EMBEDDING_MODEL, device=DEVICE)
+    if DEVICE == "cuda":
+        model.half()
 
-    if not chunks:
+    def generate_actions():
+        for batch in batched(chunks, ENCODE_WINDOW):
+            embeddings = model.encode(
+                [c["chunk_text"] for c in batch],
+                batch_size=ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+            for chunk, embedding in zip(batch, embeddings):
+                # Serialized as-is by the client's orjson serializer
+                chunk["chunk_embedding"] = embedding
+                yield {
+                    "_index": "papers_chunks",
+                    "_id": chunk["chunk_id"],
+                    "_source": chunk,
+                }
+
+    print("Embedding and indexing chunks into papers_chunks...")
+    success = 0
+    errors = []
+    for ok, item in tqdm(
+        helpers.parallel_bulk(
+            es.options(request_timeout=120),
+            generate_actions(),
+            thread_count=BULK_THREAD_COUNT,
+            chunk_size=500,
+            queue_size=4,
+            raise_on_error=False,
+            raise_on_exception=False,
+        ),
+        desc="Indexing chunks",
+        unit="chunk",
+    ):
+        if ok:
+            success += 1
+        else:
+            errors.append(item)
+
+    if success == 0 and not errors:
         print("Warning: No chunks to index")
         return {"chunks_indexed": 0, "errors": 0, "total_in_index": 0}
 
-    # Generate embeddings
-    print(f"Loading embedding model: {EMBEDDING_MODEL}")
-    model = SentenceTransformer(EMBEDDING_MODEL)
-
-    texts = [c["chunk_text"] for c in chunks]
-    print("Generating chunk embeddings...")
-    embeddings = model.encode(texts, batch_size=64, show_progress_bar=True)
-
-    for i, chunk in enumerate(chunks):
-        chunk["chunk_embedding"] = embeddings[i].tolist()
-
-    # Bulk index
-    def generate_actions():
-        for chunk in chunks:
-            yield {
-                "_index": "papers_chunks",
-                "_id": chunk["chunk_id"],
-                "_source": chunk,
-            }
-
-    print("Indexing into papers_chunks...")
-    success, errors = helpers.bulk(
-        es,
-        generate_actions(),
-        chunk_size=500,
-        raise_on_error=False,
-        raise_on_exception=False,
-    )
-
-    error_count = len(errors) if isinstance(errors, list) else 0
+    error_count = len(errors)
     if error_count > 0:
         print(f"Warning: {error_count} indexing errors")
         for err in errors[:5]:
@@ -2,17 +2,41 @@
 
 import json
 import os
+import re
 import sys
 
+import torch
 from elasticsearch import helpers
 from sentence_transformers import SentenceTransformer
 from tqdm import tqdm
 
-from config import EMBEDDING_MODEL, PAPERS_PDF_DIR, get_es_client
+from config import (
+    BULK_THREAD_COUNT,
+    EMBEDDING_MODEL,
+    PAPERS_PDF_DIR,
+    get_es_client,
+)
 
 METADATA_JSON = os.path.join(
     PAPERS_PDF_DIR, "AI_Agent_Architectures_and_Frameworks.json"
 )
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+ENCODE_BATCH_SIZE = 256 if DEVICE == "cuda" else 128
+SEMICOLON_RE = re.compile(r"\s*;\s*")
+
+
+def split_field(value):
+    """Split a semicolon-separated string into a list."""
+    if not value or not value.strip():
+        return []
+    return [v for v in SEMICOLON_RE.split(value.strip()) if v]
+
+
+def empty_to_none(value):
+    """Convert empty strings to None for keyword/date fields."""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return value
 
 
 def transform_paper(paper):
@@ -27,18 +51,6 @@ def transform_paper(paper):
     else:
         url = None
 
-    def split_field(value):
-        """Split a semicolon-separated string into a list."""
-        if not value or not value.strip():
-            return []
-        return [v.strip() for v in value.split("; ") if v.strip()]
-
-    def empty_to_none(value):
-        """Convert empty strings to None for keyword/date fields."""
-        if value is None or (isinstance(value, str) and not value.strip()):
-            return None
-        return value
-
     pub_date = empty_to_none(paper.get("publicationDate", ""))
 
     return {
@@ -87,8 +99,10 @@ def main():
     papers = [transform_paper(p) for p in raw_papers]
 
     # Generate abstract embeddings
-    print(f"Loading embedding model: {EMBEDDING_MODEL}")
-    model = SentenceTransformer(EMBEDDING_MODEL)
+    print(f"Loading embedding model: {EMBEDDING_MODEL} ({DEVICE})")
+    model = SentenceTransformer(EMBEDDING_MODEL, device=DEVICE)
+    if DEVICE == "cuda":
+        model.half()
 
     texts_to_encode = []
     for p in papers:
@@ -101,11 +115,15 @@ def main():
 
     print("Generating abstract embeddings...")
     embeddings = model.encode(
-        texts_to_encode, batch_size=32, show_progress_bar=True
+        texts_to_encode,
+        batch_size=ENCODE_BATCH_SIZE,
+        show_progress_bar=True,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
     )
 
     for i, paper in enumerate(papers):
-        paper["abstract_embedding"] = embeddings[i].tolist()
+        paper["abstract_embedding"] = embeddings[i]
 
     # Bulk index
     def generate_actions():
@@ -117,11 +135,23 @@ def main():
             }
 
     print("Indexing into papers_metadata...")
-    success, errors = helpers.bulk(
-        es, generate_actions(), raise_on_error=False, raise_on_exception=False
-    )
+    success = 0
+    errors = []
+    for ok, item in helpers.parallel_bulk(
+        es.options(request_timeout=120),
+        generate_actions(),
+        thread_count=BULK_THREAD_COUNT,
+        chunk_size=500,
+        queue_size=4,
+        raise_on_error=False,
+        raise_on_exception=False,
+    ):
+        if ok:
+            success += 1
+        else:
+            errors.append(item)
 
-    error_count = len(errors) if isinstance(errors, list) else 0
+    error_count = len(errors)
     if error_count > 0:
         print(f"Warning: {error_count} indexing errors")
         for err in errors[:5]:
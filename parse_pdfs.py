@@ -1,11 +1,17 @@
 """Parse PDF files into text chunks mapped to paper IDs."""
 
-import json
+import argparse
+import functools
+import hashlib
+import itertools
 import os
 import re
+import tempfile
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 import fitz
+import orjson
 from tqdm import tqdm
 
 from config import PAPERS_PDF_DIR
@@ -14,9 +20,21 @@ METADATA_JSON = os.path.join(
     PAPERS_PDF_DIR, "AI_Agent_Architectures_and_Frameworks.json"
 )
 OUTPUT_PATH = os.path.join(
-    os.path.dirname(os.path.abspath(__file__)), "parsed_chunks.json"
+    os.path.dirname(os.path.abspath(__file__)), "parsed_chunks.jsonl"
+)
+# Image-only PDFs skipped by extract_and_chunk_pdf, one path per line, for a
+# separate OCR pass
+NEEDS_OCR_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "needs_ocr.txt"
+)
+# Per-PDF extraction results, keyed on path, mtime and size
+CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), ".cache", "parsed_pdfs"
 )
 
+PARSE_WORKERS = int(os.environ.get("PARSE_WORKERS", os.cpu_count() or 1))
+
+PROBE_MIN_CHARS = 50
 CHUNK_TARGET_WORDS = 385
 OVERLAP_WORDS = 38
 
@@ -56,31 +74,81 @@ HEADING_RE = re.compile(
     r"|(?:[IVXLC]+\.?\s+)"        # "II. METHODS"
     r"|(?:[A-Z]\.?\s+)"           # "A. Approach" (letter-based)
     r")?"
-    r"(.+)$"
+    r"(.+?)(?:\s*\d+)?$"          # heading text, minus trailing numbering
 )
 
 ALL_CAPS_RE = re.compile(r"^[A-Z][A-Z\s:&\-]{3,}$")
 
+TITLE_PUNCTUATION_RE = re.compile(r"[^\w\s-]")
+WHITESPACE_RE = re.compile(r"\s+")
+REFERENCES_HEADING_RE = re.compile(
+    r"\n\s*(?:References|Bibliography|REFERENCES|BIBLIOGRAPHY)\s*\n",
+    re.IGNORECASE,
+)
+SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+# clean_text: a hyphenated line break, any space/tab/newline run containing
+# a newline, 2+ spaces/tabs, or a lone tab. Single spaces are never matched.
+CLEAN_RE = re.compile(r"(\w)-\n(\w)|[ \t]*\n[ \t\n]*|[ \t]{2,}|\t")
+WHITESPACE_PART_RE = re.compile(r"\n+|[ \t]+")
+# Anything other than single spaces between words (which chunk_text's word
+# counting fast path relies on)
+IRREGULAR_SPACE_RE = re.compile(r"[^\S ]| {2}|^ | $")
+
+# Exact headings ("Related Work") resolve with a hash lookup; the
+# alternations below only run for headings with extra text.
+SECTION_KEYS = frozenset(SECTION_MAP)
+
+# SECTION_MAP keys as single alternations. Alternatives are tried in dict
+# order, so the first key that matches wins, as with a loop over the map.
+# Prefix form: the heading starts with the key.
+SECTION_PREFIX_RE = re.compile("|".join(re.escape(k) for k in SECTION_MAP))
+# Substring form: each alternative is a lookahead for the key anywhere in
+# the heading, captured so the matching key can be read back.
+SECTION_SUBSTRING_RE = re.compile(
+    "|".join(f"(?=.*?({re.escape(k)}))" for k in SECTION_MAP), re.DOTALL
+)
+
 
+@functools.lru_cache(maxsize=4096)
 def normalize_title(title):
     """Normalize a title for matching: lowercase, strip colons/punctuation, collapse whitespace."""
     title = unicodedata.normalize("NFKD", title)
     title = title.replace(":", " ").replace("–", "-").replace("—", "-")
-    title = re.sub(r"[^\w\s-]", "", title.lower())
-    title = re.sub(r"\s+", " ", title).strip()
+    title = TITLE_PUNCTUATION_RE.sub("", title.lower())
+    title = WHITESPACE_RE.sub(" ", title).strip()
     return title
 
 
 def build_title_map(metadata):
     """Build normalized_title_prefix -> paper_id mapping."""
-    title_map = {}
-    for paper in metadata:
-        norm = normalize_title(paper["title"])
-        title_map[norm] = paper["paperId"]
-    return title_map
-
-
-def match_pdf_to_paper(pdf_filename, title_map):
+    return {normalize_title(paper["title"]): paper["paperId"] for paper in metadata}
+
+
+def build_title_trie(title_map):
+    """Build a character trie over normalized titles for prefix matching.
+
+    Each node is [children, entry, best]: entry is the (rank, paper_id) of a
+    title ending at the node and best the lowest-rank entry in its subtree.
+    rank is the title's position in title_map, so ties resolve in metadata
+    order.
+    """
+    root = [{}, None, None]
+    for rank, (norm_title, paper_id) in enumerate(title_map.items()):
+        entry = (rank, paper_id)
+        node = root
+        # Ranks only increase, so the first entry through a node is its best
+        if node[2] is None:
+            node[2] = entry
+        for char in norm_title:
+            node = node[0].setdefault(char, [{}, None, None])
+            if node[2] is None:
+                node[2] = entry
+        node[1] = entry
+    return root
+
+
+def match_pdf_to_paper(pdf_filename, title_map, title_trie=None):
     """Match a PDF filename to a paper_id using prefix matching."""
     name = pdf_filename.rsplit(".pdf", 1)[0]
     norm_pdf = normalize_title(name)
@@ -89,33 +157,60 @@ def match_pdf_to_paper(pdf_filename, title_map):
     if norm_pdf in title_map:
         return title_map[norm_pdf]
 
-    # Prefix match: PDF name (possibly truncated) matches start of metadata title
-    for norm_title, paper_id in title_map.items():
-        if norm_title.startswith(norm_pdf) or norm_pdf.startswith(norm_title):
-            return paper_id
-
+    if title_trie is None:
+        title_trie = build_title_trie(title_map)
+
+    # Prefix match: PDF name (possibly truncated) matches start of metadata
+    # title, or a metadata title matches the start of the PDF name. One walk
+    # down the trie finds both; the earliest candidate in metadata order wins.
+    candidates = []
+    node = title_trie
+    for char in norm_pdf:
+        if node[1] is not None:
+            # A title that is a prefix of the PDF name
+            candidates.append(node[1])
+        node = node[0].get(char)
+        if node is None:
+            break
+    else:
+        # Titles extending the PDF name
+        candidates.append(node[2])
+
+    if candidates:
+        return min(candidates)[1]
     return None
 
 
+def _clean_whitespace(match):
+    """Rewrite one CLEAN_RE match; see clean_text."""
+    if match.group(1) is not None:
+        # Hyphenated line break (e.g., "multi-\nagent" -> "multiagent")
+        return match.group(1) + match.group(2)
+    run = match.group()
+    if run == "\n" or "\n" not in run:
+        return " "
+    # Mixed run: a lone newline becomes a space, 2+ newlines become a
+    # paragraph break, and adjacent spaces collapse into one.
+    pieces = []
+    for part in WHITESPACE_PART_RE.findall(run):
+        piece = "\n\n" if part.startswith("\n\n") else " "
+        if piece == " " and pieces and pieces[-1] == " ":
+            continue
+        pieces.append(piece)
+    return "".join(pieces)
+
+
 def clean_text(text):
     """Clean extracted PDF text: fix hyphenation, collapse whitespace."""
-    # Fix hyphenated line breaks (e.g., "multi-\nagent" -> "multiagent")
-    text = re.sub(r"(\w)-\n(\w)", r"\1\2", text)
-    # Fix regular line breaks mid-sentence
-    text = re.sub(r"(?<!\n)\n(?!\n)", " ", text)
-    # Collapse whitespace
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    # One pass: fix hyphenated line breaks, turn mid-sentence line breaks
+    # into spaces, collapse runs of spaces/tabs and cap blank lines at one.
+    text = CLEAN_RE.sub(_clean_whitespace, text)
     return text.strip()
 
 
 def remove_references(text):
     """Remove everything after the last References/Bibliography heading."""
-    pattern = re.compile(
-        r"\n\s*(?:References|Bibliography|REFERENCES|BIBLIOGRAPHY)\s*\n",
-        re.IGNORECASE,
-    )
-    matches = list(pattern.finditer(text))
+    matches = list(REFERENCES_HEADING_RE.finditer(text))
     if matches:
         return text[: matches[-1].start()].strip()
     return text
@@ -126,30 +221,37 @@ def detect_section(line):
     line_stripped = line.strip()
     if not line_stripped or len(line_stripped) > 100:
         return None
+    # Headings start with a capital letter or their numbering; most body
+    # lines fail this before any regex runs
+    first = line_stripped[0]
+    if not (first.isupper() or first.isdigit()):
+        return None
 
     # Check all-caps headings
-    if ALL_CAPS_RE.match(line_stripped):
+    if line_stripped.isupper() and ALL_CAPS_RE.match(line_stripped):
         heading_text = line_stripped.lower().strip()
-        for key, section in SECTION_MAP.items():
-            if key in heading_text:
-                return section
+        if heading_text in SECTION_KEYS:
+            return SECTION_MAP[heading_text]
+        key_match = SECTION_SUBSTRING_RE.match(heading_text)
+        if key_match:
+            return SECTION_MAP[key_match.group(key_match.lastindex)]
         return None
 
     match = HEADING_RE.match(line_stripped)
     if match:
         heading_text = match.group(1).strip().lower()
-        # Remove trailing numbering artifacts
-        heading_text = re.sub(r"\s*\d+$", "", heading_text).strip()
-        for key, section in SECTION_MAP.items():
-            if heading_text == key or heading_text.startswith(key):
-                return section
+        if heading_text in SECTION_KEYS:
+            return SECTION_MAP[heading_text]
+        key_match = SECTION_PREFIX_RE.match(heading_text)
+        if key_match:
+            return SECTION_MAP[key_match.group()]
 
     return None
 
 
 def split_into_sentences(text):
     """Split text into sentences at period/question/exclamation boundaries."""
-    sentences = re.split(r"(?<=[.!?])\s+", text)
+    sentences = SENTENCE_SPLIT_RE.split(text)
     return [s for s in sentences if s.strip()]
 
 
@@ -159,30 +261,46 @@ def chunk_text(text, target_words=CHUNK_TARGET_WORDS, overlap_words=OVERLAP_WORD
     if not sentences:
         return []
 
-    chunks = []
-    current_words = []
-    current_count = 0
-
-    for sentence in sentences:
-        words = sentence.split()
-        word_count = len(words)
+    # Split once into a flat word list; chunks are then (start, end) windows
+    # over it whose ends fall on sentence boundaries. Sentences always break
+    # at whitespace, so their words are exactly the text's words.
+    words = text.split()
+    if IRREGULAR_SPACE_RE.search(text):
+        sentence_lengths = [len(sentence.split()) for sentence in sentences]
+    else:
+        # Words are separated by exactly one space: count instead of split
+        sentence_lengths = [sentence.count(" ") + 1 for sentence in sentences]
+    sentence_ends = itertools.accumulate(sentence_lengths)
 
-        if current_count + word_count > target_words and current_count > 0:
-            chunks.append(" ".join(current_words))
+    chunks = []
+    start = end = 0
+    for sentence_end in sentence_ends:
+        if sentence_end - start > target_words and end > start:
+            chunks.append(" ".join(words[start:end]))
             # Keep overlap from end of current chunk
-            overlap = current_words[-overlap_words:] if len(current_words) > overlap_words else current_words[:]
-            current_words = overlap + words
-            current_count = len(current_words)
-        else:
-            current_words.extend(words)
-            current_count += word_count
+            start = max(start, end - overlap_words)
+        end = sentence_end
 
-    if current_words:
-        chunks.append(" ".join(current_words))
+    if end > start:
+        chunks.append(" ".join(words[start:end]))
 
     return chunks
 
 
+def is_image_only(doc):
+    """Cheaply detect scanned PDFs with no text layer.
+
+    A first page with real text settles it; otherwise the PDF is image-only
+    if no page references any font (checked without extracting text).
+    """
+    if len(doc) == 0:
+        return True
+    first_page_text = doc[0].get_text("text", sort=False)
+    if len(first_page_text.strip()) >= PROBE_MIN_CHARS:
+        return False
+    return not any(doc.get_page_fonts(i) for i in range(len(doc)))
+
+
 def extract_and_chunk_pdf(pdf_path):
     """Extract text from PDF, detect sections, and return chunks."""
     try:
@@ -191,12 +309,20 @@ def extract_and_chunk_pdf(pdf_path):
         print(f"  Warning: Cannot open PDF: {e}")
         return []
 
-    full_text = ""
-    for page in doc:
-        page_text = page.get_text()
-        if page_text:
-            full_text += page_text + "\n"
-    doc.close()
+    page_texts = []
+    with doc:
+        if is_image_only(doc):
+            print(f"  Warning: Image-only PDF, queued for OCR: {pdf_path}")
+            with open(NEEDS_OCR_PATH, "a", encoding="utf-8") as f:
+                f.write(pdf_path + "\n")
+            return []
+        for page in doc:
+            page_text = page.get_text("text", sort=False)
+            if page_text:
+                page_texts.append(page_text)
+    # Drop MuPDF's cached resources so long batch runs don't accumulate them
+    fitz.TOOLS.store_shrink(100)
+    full_text = "\n".join(page_texts)
 
     if not full_text.strip():
         print("  Warning: PDF has no extractable text")
@@ -240,67 +366,155 @@ def extract_and_chunk_pdf(pdf_path):
     return all_chunks
 
 
-def main():
-    """Parse all PDFs and output parsed_chunks.json."""
-    print("=" * 60)
-    print("PARSE PDFs")
-    print("=" * 60)
+def cache_path_for(pdf_path):
+    """Return the cache file for a PDF's current (path, mtime, size)."""
+    stat = os.stat(pdf_path)
+    key = hashlib.blake2b(
+        f"{pdf_path}:{stat.st_mtime_ns}:{stat.st_size}".encode(), digest_size=16
+    ).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
 
-    with open(METADATA_JSON, "r", encoding="utf-8") as f:
-        metadata = json.load(f)
+def write_cache(cache_path, chunks):
+    """Atomically write a PDF's chunks to its cache file.
+
+    The data goes to a temp file in CACHE_DIR first and is renamed into
+    place, so an interrupted write never leaves a truncated entry behind.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps(chunks))
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_cache(cache_path, pdf_path):
+    """Load a PDF's cached chunks, re-parsing it if the entry is unreadable."""
+    try:
+        with open(cache_path, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        print(f"  Warning: Bad cache entry for '{pdf_path}' ({e}), re-parsing")
+    chunks = extract_and_chunk_pdf(pdf_path)
+    write_cache(cache_path, chunks)
+    return chunks
+
+
+def iter_parsed_chunks(force=False, stats=None):
+    """Parse all PDFs and yield chunk dicts, one PDF at a time.
+
+    PDFs unchanged since the last run are served from CACHE_DIR unless
+    force is set. If a stats dict is given, it is filled with the parse
+    counts once the generator is exhausted.
+    """
+    if stats is None:
+        stats = {}
+
+    with open(METADATA_JSON, "rb") as f:
+        metadata = orjson.loads(f.read())
     print(f"Loaded {len(metadata)} metadata entries")
 
     title_map = build_title_map(metadata)
+    title_trie = build_title_trie(title_map)
 
-    pdf_dir = PAPERS_PDF_DIR
-    pdf_files = [f for f in os.listdir(pdf_dir) if f.endswith(".pdf")]
-    print(f"Found {len(pdf_files)} PDF files")
+    with os.scandir(PAPERS_PDF_DIR) as it:
+        pdf_entries = [e for e in it if e.name.endswith(".pdf") and e.is_file()]
+    print(f"Found {len(pdf_entries)} PDF files")
 
-    all_chunks = []
     matched = 0
+    total_chunks = 0
     skipped_no_match = 0
     skipped_empty = 0
 
-    for pdf_file in tqdm(pdf_files, desc="Parsing PDFs"):
-        paper_id = match_pdf_to_paper(pdf_file, title_map)
+    worklist = []
+    for entry in pdf_entries:
+        paper_id = match_pdf_to_paper(entry.name, title_map, title_trie)
         if not paper_id:
-            print(f"\n  Warning: No metadata match for '{pdf_file[:80]}...'")
+            print(f"  Warning: No metadata match for '{entry.name[:80]}...'")
             skipped_no_match += 1
             continue
-
-        pdf_path = os.path.join(pdf_dir, pdf_file)
-        chunks = extract_and_chunk_pdf(pdf_path)
-
+        worklist.append((paper_id, entry.path))
+
+    cache_paths = [cache_path_for(pdf_path) for _, pdf_path in worklist]
+    pending = [
+        pos for pos, cache_path in enumerate(cache_paths)
+        if force or not os.path.exists(cache_path)
+    ]
+    print(f"Cached: {len(worklist) - len(pending)}, to parse: {len(pending)}")
+
+    # Extraction is CPU-bound and independent per PDF, so spread it across
+    # processes. Each result goes straight to its cache file rather than
+    # being held in memory.
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=PARSE_WORKERS) as executor:
+        futures = {
+            executor.submit(extract_and_chunk_pdf, worklist[pos][1]): pos
+            for pos in pending
+        }
+        for future in tqdm(
+            as_completed(futures), total=len(futures), desc="Parsing PDFs"
+        ):
+            chunks = future.result()
+            write_cache(cache_paths[futures[future]], chunks)
+
+    # Stream the chunks one PDF at a time, in a stable order
+    for (paper_id, pdf_path), cache_path in zip(worklist, cache_paths):
+        chunks = read_cache(cache_path, pdf_path)
         if not chunks:
             skipped_empty += 1
             continue
 
         matched += 1
+        total_chunks += len(chunks)
         for i, chunk in enumerate(chunks):
-            chunk_id = f"{paper_id}_chunk_{i:04d}"
-            all_chunks.append({
-                "chunk_id": chunk_id,
+            yield {
+                "chunk_id": f"{paper_id}_chunk_{i:04d}",
                 "paper_id": paper_id,
                 "chunk_text": chunk["chunk_text"],
                 "section_type": chunk["section_type"],
                 "chunk_index": i,
-            })
-
-    with open(OUTPUT_PATH, "w", encoding="utf-8") as f:
-        json.dump(all_chunks, f, ensure_ascii=False)
+            }
 
-    summary = {
+    stats.update({
         "papers_parsed": matched,
-        "total_chunks": len(all_chunks),
+        "total_chunks": total_chunks,
         "skipped_no_match": skipped_no_match,
         "skipped_empty": skipped_empty,
         "output_file": OUTPUT_PATH,
-    }
-    print(f"\nParsed {matched} PDFs → {len(all_chunks)} chunks")
+    })
+    print(f"\nParsed {matched} PDFs → {total_chunks} chunks")
     print(f"Skipped: {skipped_no_match} no match, {skipped_empty} empty/unreadable")
+
+
+def write_jsonl(chunks, path):
+    """Write each chunk to a JSONL file as it passes through, then yield it."""
+    with open(path, "wb") as out:
+        for chunk in chunks:
+            out.write(orjson.dumps(chunk))
+            out.write(b"\n")
+            yield chunk
+
+
+def main(force=False):
+    """Parse all PDFs and output parsed_chunks.jsonl (one chunk per line)."""
+    print("=" * 60)
+    print("PARSE PDFs")
+    print("=" * 60)
+
+    summary = {}
+    chunks = iter_parsed_chunks(force=force, stats=summary)
+    for _ in write_jsonl(chunks, OUTPUT_PATH):
+        pass
     print(f"Output: {OUTPUT_PATH}")
     return summary
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Parse PDFs into text chunks")
+    parser.add_argument(
+        "--force", action="store_true", help="Re-parse PDFs even if cached"
+    )
+    main(force=parser.parse_args().force)
@@ -1,29 +1,37 @@
 """Orchestrate the full ingestion pipeline: metadata → parse PDFs → index chunks."""
 
+import argparse
 import time
 
 from load_metadata import main as load_metadata_main
-from parse_pdfs import main as parse_pdfs_main
+from parse_pdfs import OUTPUT_PATH, iter_parsed_chunks, write_jsonl
 from index_chunks import main as index_chunks_main
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the ingestion pipeline")
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Re-parse every PDF, ignoring the per-PDF parse cache",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("RESEARCH AGENT — INGESTION PIPELINE")
     print("=" * 60)
     start = time.time()
 
     # Step 1: Load metadata (validates ES connection early)
-    print("\n[Step 1/3] Loading paper metadata into Elasticsearch...\n")
+    print("\n[Step 1/2] Loading paper metadata into Elasticsearch...\n")
     metadata_summary = load_metadata_main()
 
-    # Step 2: Parse PDFs into chunks
-    print("\n[Step 2/3] Parsing PDFs into text chunks...\n")
-    parse_summary = parse_pdfs_main()
-
-    # Step 3: Index chunks with embeddings
-    print("\n[Step 3/3] Indexing chunks into Elasticsearch...\n")
-    chunks_summary = index_chunks_main()
+    # Step 2: Parse PDFs and index their chunks with embeddings. Chunks flow
+    # straight from the parser into the indexer (and parsed_chunks.jsonl),
+    # so only one batch is held in memory at a time.
+    print("\n[Step 2/2] Parsing PDFs and indexing chunks into Elasticsearch...\n")
+    parse_summary = {}
+    chunks = iter_parsed_chunks(force=args.force, stats=parse_summary)
+    chunks_summary = index_chunks_main(chunks=write_jsonl(chunks, OUTPUT_PATH))
 
     elapsed = time.time() - start
     minutes = int(elapsed // 60)
@@ -10,12 +10,16 @@ load_dotenv(PROJECT_ROOT / ".env")
 
 KIBANA_URL = os.getenv("KIBANA_URL")
 ELASTIC_API_KEY = os.getenv("ELASTIC_API_KEY")
+WORKFLOW_ID = os.getenv("WORKFLOW_ID")
+WORKFLOW_YAML_PATH = PROJECT_ROOT / "workflows" / "research_review_loop.yaml"
 
 RESEARCHER_AGENT_ID = "research_literature_review_agent"
 REVIEWER_AGENT_ID = "peer_review_agent"
 CLAIM_VERIFICATION_AGENT_ID = "claim_verification_agent"
 MAX_ITERATIONS = 2
 AGENT_TIMEOUT = 600
+# Converse calls allowed in flight at once, across all concurrent loops
+AGENT_CONCURRENCY = int(os.getenv("AGENT_CONCURRENCY", "4"))
 
 HEADERS = {
     "Content-Type": "application/json",
@@ -9,6 +9,9 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from server.routers.research import router as research_router
 from server.mcp_server import mcp as research_mcp
+from server.services.agent import close_client
+from server.services.workflow import close_client as close_workflow_client
+from slack_bot.session import attach_session, close_session
 
 logging.basicConfig(level=logging.INFO)
 logging.getLogger("server").setLevel(logging.DEBUG)
@@ -16,13 +19,25 @@ logger = logging.getLogger(__name__)
 
 # Build the MCP sub-app early so we can wire up its lifespan.
 _mcp_http_app = research_mcp.streamable_http_app()
+# Set below when the Slack routes are mounted.
+_slack_app = None
 
 
 @asynccontextmanager
 async def lifespan(app):
-    """Run the MCP sub-app's lifespan (initializes its session manager)."""
+    """Run the MCP sub-app's lifespan (initializes its session manager).
+
+    Also gives the Slack app its shared HTTP session on startup, and closes
+    the shared Agent Builder, Kibana workflow and Slack HTTP clients on
+    shutdown.
+    """
     async with _mcp_http_app.router.lifespan_context(_mcp_http_app):
+        if _slack_app is not None:
+            attach_session(_slack_app)
         yield
+    await close_client()
+    await close_workflow_client()
+    await close_session()
 
 
 app = FastAPI(title="Research Review Agent API", lifespan=lifespan)
@@ -55,6 +70,7 @@ if os.getenv("SLACK_CLIENT_ID") and os.getenv("SLACK_SIGNING_SECRET"):
     from slack_bolt.adapter.fastapi.async_handler import AsyncSlackRequestHandler
     from slack_bot.bolt_app import bolt_app
 
+    _slack_app = bolt_app
     _slack_handler = AsyncSlackRequestHandler(bolt_app)
 
     @app.get("/slack/install")
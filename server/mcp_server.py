@@ -1,13 +1,15 @@
 """Custom MCP server exposing the research literature review orchestration loop."""
 
 import asyncio
-import json
 import logging
 import os
 import re
 import sys
+from dataclasses import dataclass
 from datetime import datetime
 
+import orjson
+
 # Ensure project root is on sys.path so `server.*` imports work
 # regardless of the working directory the process is launched from.
 _project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -40,6 +42,110 @@ mcp = FastMCP(
 )
 
 
+# ---------------------------------------------------------------------------
+# Orchestrator SSE consumption (shared by all tools)
+# ---------------------------------------------------------------------------
+
+_SSE_EVENT_RE = re.compile(rb"event: ([^\n]*)(?:\ndata: ([^\n]*))?")
+
+
+def _parse_sse(sse_line: bytes) -> tuple[str, dict] | None:
+    """Parse one orchestrator SSE event into (event_type, data).
+
+    Returns None for non-event lines and events whose data isn't valid JSON.
+    """
+    match = _SSE_EVENT_RE.match(sse_line)
+    if not match:
+        return None
+    try:
+        data = orjson.loads(match.group(2) or b"{}")
+    except orjson.JSONDecodeError:
+        return None
+    return match.group(1).decode(), data
+
+
+@dataclass
+class _StreamState:
+    """Progress and outcome of one tool's orchestrator stream."""
+
+    total_steps: int
+    show_iteration: bool = False
+    step: int = 0
+    report: str | None = None
+    iteration_info: str | None = None
+    error: str | None = None
+
+
+async def _on_agent_start(data: dict, ctx: Context, state: _StreamState) -> None:
+    agent = data.get("agent", "Agent")
+    if state.show_iteration:
+        iteration = data.get("iteration", 1)
+        await ctx.info(f"{agent} starting (iteration {iteration})...")
+    else:
+        await ctx.info(f"{agent} starting...")
+    state.step += 1
+    await ctx.report_progress(state.step, state.total_steps)
+
+
+async def _on_reasoning(data: dict, ctx: Context, state: _StreamState) -> None:
+    text = data.get("text", "")
+    if text:
+        await ctx.info(f"Thinking: {text[:150]}")
+
+
+async def _on_tool_call(data: dict, ctx: Context, state: _StreamState) -> None:
+    tool_id = data.get("tool_id", "")
+    await ctx.info(f"Using tool: {tool_id}")
+
+
+async def _on_agent_end(data: dict, ctx: Context, state: _StreamState) -> None:
+    agent = data.get("agent", "Agent")
+    await ctx.info(f"{agent} finished.")
+    state.step += 1
+    await ctx.report_progress(state.step, state.total_steps)
+
+
+async def _on_verdict(data: dict, ctx: Context, state: _StreamState) -> None:
+    verdict = data.get("verdict", "")
+    iteration = data.get("iteration", 1)
+    await ctx.info(f"Peer review verdict (iteration {iteration}): {verdict}")
+
+
+async def _on_result(data: dict, ctx: Context, state: _StreamState) -> None:
+    state.report = data.get("report")
+    state.iteration_info = data.get("iteration_info")
+
+
+async def _on_error(data: dict, ctx: Context, state: _StreamState) -> None:
+    state.error = data.get("message", "Unknown error")
+
+
+_EVENT_HANDLERS = {
+    "agent_start": _on_agent_start,
+    "reasoning": _on_reasoning,
+    "tool_call": _on_tool_call,
+    "agent_end": _on_agent_end,
+    "verdict": _on_verdict,
+    "result": _on_result,
+    "error": _on_error,
+}
+
+
+async def _consume_stream(events, ctx: Context, state: _StreamState) -> None:
+    """Dispatch orchestrator SSE events to handlers until done or an error."""
+    async for sse_line in events:
+        parsed = _parse_sse(sse_line)
+        if parsed is None:
+            continue
+        event_type, data = parsed
+        handler = _EVENT_HANDLERS.get(event_type)
+        if handler is None:
+            continue
+        await handler(data, ctx, state)
+        if state.error is not None:
+            return
+
+
 @mcp.tool()
 async def research_literature_review(topic: str, ctx: Context) -> str:
     """Run a full peer-reviewed literature review on a research topic.
@@ -59,72 +165,24 @@ async def research_literature_review(topic: str, ctx: Context) -> str:
     """
     from server.services.orchestrator import run_research_loop
 
-    report = None
-    iteration_info = None
-    step = 0
+    state = _StreamState(total_steps=10, show_iteration=True)
 
     try:
-        async for sse_line in run_research_loop(topic):
-            if not sse_line.startswith("event: "):
-                continue
-
-            lines = sse_line.strip().split("\n")
-            event_type = lines[0].replace("event: ", "")
-            data_str = lines[1].replace("data: ", "") if len(lines) > 1 else "{}"
-
-            try:
-                data = json.loads(data_str)
-            except json.JSONDecodeError:
-                continue
-
-            if event_type == "agent_start":
-                agent = data.get("agent", "Agent")
-                iteration = data.get("iteration", 1)
-                await ctx.info(f"{agent} starting (iteration {iteration})...")
-                step += 1
-                await ctx.report_progress(step, 10)
-
-            elif event_type == "reasoning":
-                text = data.get("text", "")
-                if text:
-                    await ctx.info(f"Thinking: {text[:150]}")
-
-            elif event_type == "tool_call":
-                tool_id = data.get("tool_id", "")
-                await ctx.info(f"Using tool: {tool_id}")
-
-            elif event_type == "agent_end":
-                agent = data.get("agent", "Agent")
-                await ctx.info(f"{agent} finished.")
-                step += 1
-                await ctx.report_progress(step, 10)
-
-            elif event_type == "verdict":
-                verdict = data.get("verdict", "")
-                iteration = data.get("iteration", 1)
-                await ctx.info(
-                    f"Peer review verdict (iteration {iteration}): {verdict}"
-                )
-
-            elif event_type == "result":
-                report = data.get("report")
-                iteration_info = data.get("iteration_info")
-
-            elif event_type == "error":
-                msg = data.get("message", "Unknown error")
-                return f"Error: {msg}"
-
+        await _consume_stream(run_research_loop(topic), ctx, state)
     except (asyncio.CancelledError, Exception) as e:
-        if report:
+        if state.report:
             logger.warning(f"Request interrupted ({type(e).__name__}), returning partial report.")
-            return _wrap_output(report, topic, "Note: Peer review may not have completed due to timeout.")
+            return _wrap_output(state.report, topic, "Note: Peer review may not have completed due to timeout.")
         logger.error(f"Request failed before report was generated: {e}")
         raise
 
-    if not report:
+    if state.error is not None:
+        return f"Error: {state.error}"
+
+    if not state.report:
         return "Error: No report was generated."
 
-    return _wrap_output(report, topic, iteration_info)
+    return _wrap_output(state.report, topic, state.iteration_info)
 
 
 @mcp.tool()
@@ -143,64 +201,24 @@ async def research_draft(topic: str, ctx: Context) -> str:
     """
     from server.services.orchestrator import run_research_loop
 
-    report = None
-    iteration_info = None
-    step = 0
+    state = _StreamState(total_steps=5)
 
     try:
-        async for sse_line in run_research_loop(topic, skip_review=True):
-            if not sse_line.startswith("event: "):
-                continue
-
-            lines = sse_line.strip().split("\n")
-            event_type = lines[0].replace("event: ", "")
-            data_str = lines[1].replace("data: ", "") if len(lines) > 1 else "{}"
-
-            try:
-                data = json.loads(data_str)
-            except json.JSONDecodeError:
-                continue
-
-            if event_type == "agent_start":
-                agent = data.get("agent", "Agent")
-                await ctx.info(f"{agent} starting...")
-                step += 1
-                await ctx.report_progress(step, 5)
-
-            elif event_type == "reasoning":
-                text = data.get("text", "")
-                if text:
-                    await ctx.info(f"Thinking: {text[:150]}")
-
-            elif event_type == "tool_call":
-                tool_id = data.get("tool_id", "")
-                await ctx.info(f"Using tool: {tool_id}")
-
-            elif event_type == "agent_end":
-                agent = data.get("agent", "Agent")
-                await ctx.info(f"{agent} finished.")
-                step += 1
-                await ctx.report_progress(step, 5)
-
-            elif event_type == "result":
-                report = data.get("report")
-                iteration_info = data.get("iteration_info")
-
-            elif event_type == "error":
-                msg = data.get("message", "Unknown error")
-                return f"Error: {msg}"
-
+        await _consume_stream(run_research_loop(topic, skip_review=True), ctx, state)
     except (asyncio.CancelledError, Exception) as e:
-        if report:
+        if state.report:
             logger.warning(f"Request interrupted ({type(e).__name__}), returning partial report.")
-            return _wrap_output(report, topic)
+            return _wrap_output(state.report, topic)
         logger.error(f"Request failed before report was generated: {e}")
         raise
 
-    if not report:
+    if state.error is not None:
+        return f"Error: {state.error}"
+
+    if not state.report:
         return "Error: No report was generated."
 
-    return _wrap_output(report, topic, iteration_info)
+    return _wrap_output(state.report, topic, state.iteration_info)
 
 
 @mcp.tool()
@@ -218,64 +236,24 @@ async def verify_claim(claim: str, ctx: Context) -> str:
     """
     from server.services.orchestrator import run_claim_verification
 
-    report = None
-    iteration_info = None
-    step = 0
+    state = _StreamState(total_steps=5)
 
     try:
-        async for sse_line in run_claim_verification(claim):
-            if not sse_line.startswith("event: "):
-                continue
-
-            lines = sse_line.strip().split("\n")
-            event_type = lines[0].replace("event: ", "")
-            data_str = lines[1].replace("data: ", "") if len(lines) > 1 else "{}"
-
-            try:
-                data = json.loads(data_str)
-            except json.JSONDecodeError:
-                continue
-
-            if event_type == "agent_start":
-                agent = data.get("agent", "Agent")
-                await ctx.info(f"{agent} starting...")
-                step += 1
-                await ctx.report_progress(step, 5)
-
-            elif event_type == "reasoning":
-                text = data.get("text", "")
-                if text:
-                    await ctx.info(f"Thinking: {text[:150]}")
-
-            elif event_type == "tool_call":
-                tool_id = data.get("tool_id", "")
-                await ctx.info(f"Using tool: {tool_id}")
-
-            elif event_type == "agent_end":
-                agent = data.get("agent", "Agent")
-                await ctx.info(f"{agent} finished.")
-                step += 1
-                await ctx.report_progress(step, 5)
-
-            elif event_type == "result":
-                report = data.get("report")
-                iteration_info = data.get("iteration_info")
-
-            elif event_type == "error":
-                msg = data.get("message", "Unknown error")
-                return f"Error: {msg}"
-
+        await _consume_stream(run_claim_verification(claim), ctx, state)
     except (asyncio.CancelledError, Exception) as e:
-        if report:
+        if state.report:
             logger.warning(f"Request interrupted ({type(e).__name__}), returning partial report.")
-            return _wrap_output(report, claim)
+            return _wrap_output(state.report, claim)
         logger.error(f"Request failed before report was generated: {e}")
         raise
 
-    if not report:
+    if state.error is not None:
+        return f"Error: {state.error}"
+
+    if not state.report:
         return "Error: No verification report was generated."
 
-    return _wrap_output(report, claim, iteration_info)
+    return _wrap_output(state.report, claim, state.iteration_info)
 
 
 _REPORTS_DIR = os.path.join(_project_root, "reports")
@@ -1,8 +1,8 @@
 """SSE streaming endpoint for research with real-time reasoning traces."""
 
-import json
 import logging
 
+import orjson
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
@@ -19,8 +19,8 @@ class ResearchRequest(BaseModel):
     mode: str = "research"
 
 
-def _sse(event: str, data: dict) -> str:
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
 
 
 async def _safe_stream(topic: str, mode: str = "research"):
@@ -37,7 +37,7 @@ async def _safe_stream(topic: str, mode: str = "research"):
         )
         async for chunk in generator:
             yield chunk
-            if "event: done" in chunk:
+            if chunk.startswith(b"event: done\n"):
                 done_sent = True
     except GeneratorExit:
         # Client disconnected — clean shutdown, nothing to send
@@ -1,26 +1,59 @@
 """Elastic Agent Builder converse streaming client."""
 
-import json
+import asyncio
 import logging
 from typing import AsyncGenerator
 
 import httpx
+import orjson
 
-from server.config import KIBANA_URL, HEADERS, AGENT_TIMEOUT
+from server.config import KIBANA_URL, HEADERS, AGENT_TIMEOUT, AGENT_CONCURRENCY
 
 logger = logging.getLogger(__name__)
 
+_converse_slots = asyncio.Semaphore(AGENT_CONCURRENCY)
+
+# Shared across calls so back-to-back agent calls reuse keep-alive
+# connections instead of reconnecting each time
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared converse client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=httpx.Timeout(AGENT_TIMEOUT, connect=30),
+            # The converse endpoint doesn't redirect; a redirect means
+            # KIBANA_URL is wrong and is reported as an error below
+            follow_redirects=False,
+            limits=httpx.Limits(max_keepalive_connections=16, keepalive_expiry=60),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared converse client. Called on app shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
 
 async def stream_converse(
     agent_id: str,
     message: str,
     conversation_id: str | None = None,
-) -> AsyncGenerator[dict, None]:
+) -> AsyncGenerator[tuple[str, dict], None]:
     """Stream a conversation with an Elastic Agent Builder agent.
 
     Calls POST {KIBANA_URL}/api/agent_builder/converse/async and yields
-    parsed SSE events as dicts: {"event": "<type>", "data": {<payload>}}.
+    parsed SSE events as (event_type, data) tuples.
 
+    At most AGENT_CONCURRENCY calls stream at once; further calls wait
+    for a slot. Once a call holds its slot it gets AGENT_TIMEOUT seconds in
+    total: the HTTP read timeout only catches a silent agent, so one that
+    keeps streaming past the deadline is cut off with an error event.
     Never raises — yields an error event on failure instead.
     """
     url = f"{KIBANA_URL}/api/agent_builder/converse/async"
@@ -40,15 +73,21 @@ async def stream_converse(
     )
 
     try:
-        async with httpx.AsyncClient(
-            timeout=httpx.Timeout(AGENT_TIMEOUT, connect=30),
-            follow_redirects=True,
-        ) as client:
+        client = _get_client()
+        async with _converse_slots:
+            # Time spent queued for a slot doesn't count against the agent
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + AGENT_TIMEOUT
             async with client.stream(
                 "POST", url, json=payload, headers=headers,
             ) as response:
                 logger.info("Converse API response status: %s", response.status_code)
 
+                if response.is_redirect:
+                    logger.warning(
+                        "Converse API redirected to %s; check KIBANA_URL",
+                        response.headers.get("location"),
+                    )
                 if response.status_code != 200:
                     body = await response.aread()
                     detail = body.decode(errors="replace")
@@ -56,28 +95,25 @@ async def stream_converse(
                         "Converse API error %s for agent %s: %s",
                         response.status_code, agent_id, detail,
                     )
-                    yield {
-                        "event": "error",
-                        "data": {
-                            "message": f"Agent API returned {response.status_code}: {detail[:500]}",
-                        },
+                    yield "error", {
+                        "message": f"Agent API returned {response.status_code}: {detail[:500]}",
                     }
                     return
 
                 current_event = ""
-                async for line in response.aiter_lines():
-                    if line.startswith("event: "):
-                        current_event = line[7:].strip()
-                    elif line.startswith("data: ") and current_event:
-                        raw = line[6:]
-                        data = _parse_data(raw)
-                        # Elastic API wraps event payloads in a "data" key
-                        inner = data.get("data")
-                        if isinstance(inner, dict):
-                            data = inner
-                        yield {"event": current_event, "data": data}
+                async for line in _aiter_raw_lines(response):
+                    if line.startswith(b"event: "):
+                        current_event = line[7:].strip().decode()
+                    elif line.startswith(b"data: ") and current_event:
+                        if loop.time() > deadline:
+                            yield "error", {
+                                "message": f"Agent timed out after {AGENT_TIMEOUT}s",
+                            }
+                            return
+                        data = _parse_data(line[6:])
+                        yield current_event, data
                         current_event = ""
-                    elif line.strip() == "":
+                    elif not line.strip():
                         current_event = ""
 
     except GeneratorExit:
@@ -85,15 +121,40 @@ async def stream_converse(
         return
     except BaseException as exc:
         logger.exception("stream_converse failed for agent %s", agent_id)
-        yield {
-            "event": "error",
-            "data": {"message": f"Agent connection error: {type(exc).__name__}: {exc}"},
+        yield "error", {
+            "message": f"Agent connection error: {type(exc).__name__}: {exc}",
         }
 
 
-def _parse_data(raw: str) -> dict:
-    """Parse SSE data field, handling malformed JSON gracefully."""
+async def _aiter_raw_lines(response: httpx.Response) -> AsyncGenerator[bytes, None]:
+    """Yield the lines of a streamed response as bytes, without line endings.
+
+    Works on one byte buffer with a cursor rather than aiter_lines(), which
+    decodes every chunk and rebuilds strings for each line; SSE field names
+    are matched on the raw bytes and only payloads get decoded.
+    """
+    buf = bytearray()
+    async for chunk in response.aiter_bytes(chunk_size=8192):
+        buf += chunk
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            stop = end - 1 if end > start and buf[end - 1] == 0x0D else end  # \r\n
+            yield bytes(buf[start:stop])
+            start = end + 1
+        del buf[:start]
+    if buf:
+        yield bytes(buf)
+
+
+def _parse_data(raw: bytes) -> dict:
+    """Parse SSE data field, handling malformed JSON gracefully.
+
+    The Elastic API wraps event payloads in a "data" key; the inner payload
+    is returned when present.
+    """
     try:
-        return json.loads(raw)
-    except (json.JSONDecodeError, ValueError):
-        return {"raw": raw}
+        data = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return {"raw": raw.decode(errors="replace")}
+    inner = data.get("data")
+    return inner if isinstance(inner, dict) else data
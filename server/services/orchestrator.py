@@ -1,19 +1,27 @@
 """Research-review loop orchestrator using Elastic Converse streaming."""
 
-import json
 import logging
 import re
 from typing import AsyncGenerator
 
+import orjson
+
 from server.config import RESEARCHER_AGENT_ID, REVIEWER_AGENT_ID, CLAIM_VERIFICATION_AGENT_ID, MAX_ITERATIONS
 from server.services.agent import stream_converse
 
 logger = logging.getLogger(__name__)
 
+REFERENCES_HEADING_RE = re.compile(r"#+\s*references?\b", re.IGNORECASE)
+PAPER_ID_RE = re.compile(r"paper_id:\s*([^\s,)\]]+)")
+VERDICT_RE = re.compile(r"VERDICT:\s*(PASS|REVISION_NEEDED)", re.IGNORECASE)
+# Greedy, so it ends at the last "verdict" in the text
+LAST_VERDICT_RE = re.compile(r".*verdict", re.IGNORECASE | re.DOTALL)
+PASS_RE = re.compile(r"pass", re.IGNORECASE)
+
 
-def _sse(event: str, data: dict) -> str:
-    """Format a single SSE event string."""
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+def _sse(event: str, data: dict) -> bytes:
+    """Format a single SSE event as bytes, ready to write to the response."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
 
 
 def _build_researcher_prompt(topic: str, iteration: int,
@@ -49,16 +57,14 @@ def _build_researcher_prompt(topic: str, iteration: int,
 
 def _extract_paper_ids(report: str) -> list[str]:
     """Extract paper_ids from the References section of a researcher report."""
-    paper_ids: list[str] = []
-    refs_match = re.search(r"(?i)#+\s*references?\b", report)
+    refs_match = REFERENCES_HEADING_RE.search(report)
     if not refs_match:
-        return paper_ids
-    refs_section = report[refs_match.start():]
-    for m in re.finditer(r"paper_id:\s*([^\s,)\]]+)", refs_section):
-        pid = m.group(1).strip().rstrip(".")
-        if pid and pid not in paper_ids:
-            paper_ids.append(pid)
-    return paper_ids
+        return []
+    # Scan from the heading onward without copying the tail of the report
+    matches = PAPER_ID_RE.finditer(report, refs_match.start())
+    pids = (m.group(1).strip().rstrip(".") for m in matches)
+    # dict keys dedupe in O(1) while keeping first-seen order
+    return list(dict.fromkeys(pid for pid in pids if pid))
 
 
 def _build_reviewer_prompt(draft: str, iteration: int,
@@ -88,10 +94,12 @@ def _parse_verdict(review_text: str) -> str:
 
     Falls back to REVISION_NEEDED if not found (conservative).
     """
-    match = re.search(r"VERDICT:\s*(PASS|REVISION_NEEDED)", review_text, re.IGNORECASE)
+    match = VERDICT_RE.search(review_text)
     if match:
         return match.group(1).upper()
-    if "PASS" in review_text.upper().split("VERDICT")[-1] if "VERDICT" in review_text.upper() else False:
+    # Otherwise, any "PASS" after the last mention of a verdict
+    last_verdict = LAST_VERDICT_RE.match(review_text)
+    if last_verdict and PASS_RE.search(review_text, last_verdict.end()):
         return "PASS"
     return "REVISION_NEEDED"
 
@@ -101,8 +109,8 @@ async def _stream_agent(
     agent_label: str,
     prompt: str,
     iteration: int,
-) -> AsyncGenerator[tuple[str, str | None], None]:
-    """Stream an agent call, yielding (sse_string, final_message_or_none) tuples.
+) -> AsyncGenerator[tuple[bytes, str | None], None]:
+    """Stream an agent call, yielding (sse_bytes, final_message_or_none) tuples.
 
     Forwards reasoning/tool_call/tool_result/message_chunk events to the client
     and accumulates the agent's final message text from message_chunk events.
@@ -114,12 +122,12 @@ async def _stream_agent(
     }), None
 
     final_message_parts: list[str] = []
+    # message_complete carries the whole message; once it arrives, chunks
+    # no longer need to be kept for reassembly
+    complete_message: str | None = None
 
     try:
-        async for event in stream_converse(agent_id, prompt):
-            etype = event["event"]
-            edata = event["data"]
-
+        async for etype, edata in stream_converse(agent_id, prompt):
             if etype == "error":
                 yield _sse("error", {
                     "message": edata.get("message", "Agent error"),
@@ -135,29 +143,25 @@ async def _stream_agent(
                 }
                 yield _sse("reasoning", payload), None
 
-            elif etype == "tool_call":
-                payload = {**edata, "agent": agent_label, "iteration": iteration}
-                yield _sse("tool_call", payload), None
-
-            elif etype == "tool_result":
-                payload = {**edata, "agent": agent_label, "iteration": iteration}
-                yield _sse("tool_result", payload), None
+            elif etype in ("tool_call", "tool_result", "tool_progress"):
+                # edata is a fresh dict per event, so tag it in place rather
+                # than copying it
+                edata["agent"] = agent_label
+                edata["iteration"] = iteration
+                yield _sse(etype, edata), None
 
             elif etype == "message_chunk":
                 text = edata.get("text_chunk", "")
                 payload = {"text": text, "agent": agent_label, "iteration": iteration}
                 yield _sse("message_chunk", payload), None
-                if text:
+                if text and complete_message is None:
                     final_message_parts.append(text)
 
-            elif etype == "tool_progress":
-                payload = {**edata, "agent": agent_label, "iteration": iteration}
-                yield _sse("tool_progress", payload), None
-
             elif etype == "message_complete":
                 text = edata.get("message_content", "")
                 if text:
-                    final_message_parts = [text]
+                    complete_message = text
+                    final_message_parts.clear()
 
             elif etype in (
                 "conversation_id_set", "conversation_created",
@@ -179,7 +183,10 @@ async def _stream_agent(
             "iteration": iteration,
         }), None
 
-    final_message = "".join(final_message_parts)
+    if complete_message is not None:
+        final_message = complete_message
+    else:
+        final_message = "".join(final_message_parts)
 
     yield _sse("agent_end", {
         "agent": agent_label,
@@ -187,8 +194,8 @@ async def _stream_agent(
     }), final_message
 
 
-async def run_research_loop(topic: str, skip_review: bool = False) -> AsyncGenerator[str, None]:
-    """Orchestrate the research-review loop, yielding SSE event strings.
+async def run_research_loop(topic: str, skip_review: bool = False) -> AsyncGenerator[bytes, None]:
+    """Orchestrate the research-review loop, yielding encoded SSE events.
 
     Runs up to MAX_ITERATIONS of researcher → reviewer cycles, forwarding
     all agent reasoning events in real-time.
@@ -290,8 +297,8 @@ async def run_research_loop(topic: str, skip_review: bool = False) -> AsyncGener
         yield _sse("done", {})
 
 
-async def run_claim_verification(claim: str) -> AsyncGenerator[str, None]:
-    """Run a single-pass claim verification, yielding SSE event strings.
+async def run_claim_verification(claim: str) -> AsyncGenerator[bytes, None]:
+    """Run a single-pass claim verification, yielding encoded SSE events.
 
     Uses the Claim Verification Agent to evaluate a claim against the corpus.
     No peer review loop — single pass only.
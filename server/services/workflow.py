@@ -1,16 +1,49 @@
 """Core workflow logic — extracted from app.py (lines 32-133)."""
 
-import requests
+import httpx
 
 from server.config import KIBANA_URL, HEADERS, WORKFLOW_ID, WORKFLOW_YAML_PATH
 
+# (st_mtime, text) of the last read, so edits to the YAML are picked up
+# without restarting the server.
+_yaml_cache: tuple[float, str] | None = None
+
 
 def load_workflow_yaml() -> str:
-    """Read the workflow YAML file as a string."""
-    return WORKFLOW_YAML_PATH.read_text(encoding="utf-8")
+    """Read the workflow YAML file as a string (re-read when its mtime changes)."""
+    global _yaml_cache
+    mtime = WORKFLOW_YAML_PATH.stat().st_mtime
+    if _yaml_cache is None or _yaml_cache[0] != mtime:
+        _yaml_cache = (mtime, WORKFLOW_YAML_PATH.read_text(encoding="utf-8"))
+    return _yaml_cache[1]
+
+
+# Shared across calls so repeated execution polls reuse keep-alive
+# connections instead of opening a new one per request.
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared Kibana client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _client
+
 
+async def close_client() -> None:
+    """Close the shared Kibana client. Called on app shutdown."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
-def trigger_workflow(topic: str) -> str:
+
+async def trigger_workflow(topic: str) -> str:
     """Trigger the Research Review Loop workflow and return the execution ID."""
     url = f"{KIBANA_URL}/api/workflows/test"
     payload = {
@@ -18,22 +51,22 @@ def trigger_workflow(topic: str) -> str:
         "workflowId": WORKFLOW_ID,
         "workflowYaml": load_workflow_yaml(),
     }
-    resp = requests.post(url, headers=HEADERS, json=payload, timeout=30)
+    resp = await _get_client().post(url, json=payload)
     resp.raise_for_status()
     data = resp.json()
     return data["workflowExecutionId"]
 
 
-def get_execution(execution_id: str) -> dict:
+async def get_execution(execution_id: str) -> dict:
     """Fetch the current state of a workflow execution."""
     url = f"{KIBANA_URL}/api/workflowExecutions/{execution_id}"
-    resp = requests.get(url, headers=HEADERS, timeout=30)
+    resp = await _get_client().get(url)
     resp.raise_for_status()
     return resp.json()
 
 
-def extract_step_output(execution: dict, step_id: str) -> str | None:
-    """Extract the output from a specific step execution.
+def index_step_outputs(execution: dict) -> dict:
+    """Map each step ID to the output of its first finished execution.
 
     The API returns stepExecutions with:
     - stepId: the step name from the YAML
@@ -41,24 +74,30 @@ def extract_step_output(execution: dict, step_id: str) -> str | None:
     - output: dict with "message" (ai.agent) or "content" (ai.prompt),
               or a plain string (console steps)
 
-    Skip wrapper entries like step_level_timeout.
+    Skip wrapper entries like step_level_timeout and steps with no output.
+    Built once per execution so lookups don't rescan stepExecutions.
     """
+    outputs = {}
     for step in execution.get("stepExecutions", []):
-        if step.get("stepId") != step_id:
-            continue
         if step.get("stepType") == "step_level_timeout":
             continue
-
         output = step.get("output")
         if output is None:
             continue
+        outputs.setdefault(step.get("stepId"), output)
+    return outputs
 
-        if isinstance(output, str):
-            return output
 
-        return output.get("message") or output.get("content")
+def extract_step_output(outputs: dict, step_id: str) -> str | None:
+    """Extract the output text of a step from index_step_outputs()."""
+    output = outputs.get(step_id)
+    if output is None:
+        return None
 
-    return None
+    if isinstance(output, str):
+        return output
+
+    return output.get("message") or output.get("content")
 
 
 def find_final_report(execution: dict) -> tuple[str | None, str | None, str | None]:
@@ -67,21 +106,23 @@ def find_final_report(execution: dict) -> tuple[str | None, str | None, str | No
     Checks v3 -> v2 -> v1 to get the most revised version.
     Returns (report, review, verdict_info).
     """
-    report = extract_step_output(execution, "researcher_draft_v3")
+    outputs = index_step_outputs(execution)
+
+    report = extract_step_output(outputs, "researcher_draft_v3")
     if report:
-        review = extract_step_output(execution, "review_v3")
+        review = extract_step_output(outputs, "review_v3")
         return report, review, "Iteration 3 (final revision)"
 
-    report = extract_step_output(execution, "researcher_draft_v2")
+    report = extract_step_output(outputs, "researcher_draft_v2")
     if report:
-        review = extract_step_output(execution, "review_v2")
-        verdict = extract_step_output(execution, "parse_verdict_v2")
+        review = extract_step_output(outputs, "review_v2")
+        verdict = extract_step_output(outputs, "parse_verdict_v2")
         return report, review, f"Iteration 2 (verdict: {verdict or 'unknown'})"
 
-    report = extract_step_output(execution, "researcher_draft_v1")
+    report = extract_step_output(outputs, "researcher_draft_v1")
     if report:
-        review = extract_step_output(execution, "review_v1")
-        verdict = extract_step_output(execution, "parse_verdict_v1")
+        review = extract_step_output(outputs, "review_v1")
+        verdict = extract_step_output(outputs, "parse_verdict_v1")
         return report, review, f"Iteration 1 (verdict: {verdict or 'unknown'})"
 
     return None, None, None
@@ -89,14 +130,15 @@ def find_final_report(execution: dict) -> tuple[str | None, str | None, str | No
 
 def get_iteration_summary(execution: dict) -> list[str]:
     """Build a summary of which iterations ran and their verdicts."""
+    outputs = index_step_outputs(execution)
     summary = []
-    v1 = extract_step_output(execution, "parse_verdict_v1")
+    v1 = extract_step_output(outputs, "parse_verdict_v1")
     if v1:
         summary.append(f"Iteration 1: {v1}")
-    v2 = extract_step_output(execution, "parse_verdict_v2")
+    v2 = extract_step_output(outputs, "parse_verdict_v2")
     if v2:
         summary.append(f"Iteration 2: {v2}")
-    v3_review = extract_step_output(execution, "review_v3")
+    v3_review = extract_step_output(outputs, "review_v3")
     if v3_review:
         summary.append("Iteration 3: Final review completed")
     return summary
@@ -1,5 +1,7 @@
 """Create (or recreate) the papers_metadata and papers_chunks Elasticsearch indexes."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 from config import get_es_client
 
 INDEXES = {
@@ -53,6 +55,21 @@ INDEXES = {
 }
 
 
+def recreate_index(es, name, body):
+    """Delete an index if it exists, then create it with the given body."""
+    try:
+        # A 404 just means there was nothing to delete, so skip the
+        # separate exists() round-trip
+        resp = es.options(ignore_status=404).indices.delete(index=name)
+        if resp.meta.status == 200:
+            print(f"Deleted existing index: {name}")
+
+        es.indices.create(index=name, body=body)
+        print(f"Created index: {name}")
+    except Exception as e:
+        print(f"Error with index '{name}': {e}")
+
+
 def create_indexes():
     try:
         es = get_es_client()
@@ -60,16 +77,10 @@ def create_indexes():
         print(f"Failed to connect to Elasticsearch: {e}")
         return
 
-    for name, body in INDEXES.items():
-        try:
-            if es.indices.exists(index=name):
-                es.indices.delete(index=name)
-                print(f"Deleted existing index: {name}")
-
-            es.indices.create(index=name, body=body)
-            print(f"Created index: {name}")
-        except Exception as e:
-            print(f"Error with index '{name}': {e}")
+    # The indexes are independent, so recreate them concurrently
+    with ThreadPoolExecutor(max_workers=len(INDEXES)) as executor:
+        for name, body in INDEXES.items():
+            executor.submit(recreate_index, es, name, body)
 
 
 if __name__ == "__main__":
@@ -27,6 +27,12 @@ from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 
 from slack_bot.handlers import register_handlers
+from slack_bot.session import attach_session, close_session
+
+try:
+    import uvloop
+except ImportError:  # Not available on Windows; fall back to asyncio's loop
+    uvloop = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -36,10 +42,17 @@ register_handlers(app)
 
 
 async def main():
+    attach_session(app)
     handler = AsyncSocketModeHandler(app, os.environ["SLACK_APP_TOKEN"])
     logger.info("Slack bot starting (Socket Mode)...")
-    await handler.start_async()
+    try:
+        await handler.start_async()
+    finally:
+        await close_session()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -1,6 +1,39 @@
 """Convert Markdown to Slack mrkdwn format and split long messages."""
 
 import re
+from typing import Iterator
+
+
+# A line whose stripped text starts with ``` toggles a code block
+CODE_FENCE_RE = re.compile(r"^[^\S\n]*```.*$", re.MULTILINE)
+# "# Title" -> "*Title*". [^\S\n] keeps whitespace matches within one line.
+HEADER_RE = re.compile(r"^(#{1,6})[^\S\n]+(.+)$", re.MULTILINE)
+# Bold and link conversions skip header lines: the leading alternative
+# consumes a whole header line, which is then returned unchanged. Neither
+# may span lines.
+BOLD_RE = re.compile(r"^#{1,6}[^\S\n]+.+$|\*\*(.+?)\*\*", re.MULTILINE)
+LINK_RE = re.compile(
+    r"^#{1,6}[^\S\n]+.+$|\[([^\]\n]+)\]\(([^)\n]+)\)", re.MULTILINE
+)
+
+
+def _bold(match: re.Match) -> str:
+    if match.group(1) is None:
+        return match.group()
+    return f"*{match.group(1)}*"
+
+
+def _link(match: re.Match) -> str:
+    if match.group(1) is None:
+        return match.group()
+    return f"<{match.group(2)}|{match.group(1)}>"
+
+
+def _convert_prose(text: str) -> str:
+    """Convert headers, bold and links in a stretch of text outside code blocks."""
+    text = BOLD_RE.sub(_bold, text)
+    text = LINK_RE.sub(_link, text)
+    return HEADER_RE.sub(r"\n*\2*", text)
 
 
 def md_to_mrkdwn(text: str) -> str:
@@ -8,62 +41,47 @@ def md_to_mrkdwn(text: str) -> str:
 
     Handles headers, bold, links. Leaves code blocks untouched.
     """
-    lines = text.split("\n")
+    # Convert whole runs of prose between code fences at once rather
+    # than line by line.
     result = []
+    pos = 0
     in_code_block = False
 
-    for line in lines:
-        if line.strip().startswith("```"):
-            in_code_block = not in_code_block
-            result.append(line)
-            continue
+    for fence in CODE_FENCE_RE.finditer(text):
+        segment = text[pos:fence.start()]
+        result.append(segment if in_code_block else _convert_prose(segment))
+        result.append(fence.group())
+        in_code_block = not in_code_block
+        pos = fence.end()
 
-        if in_code_block:
-            result.append(line)
-            continue
+    segment = text[pos:]
+    result.append(segment if in_code_block else _convert_prose(segment))
+    return "".join(result)
 
-        # Headers: # Title -> *Title*
-        header_match = re.match(r"^(#{1,6})\s+(.+)$", line)
-        if header_match:
-            result.append(f"\n*{header_match.group(2)}*")
-            continue
 
-        # Bold: **text** -> *text*
-        line = re.sub(r"\*\*(.+?)\*\*", r"*\1*", line)
-
-        # Links: [text](url) -> <url|text>
-        line = re.sub(r"\[([^\]]+)\]\(([^)]+)\)", r"<\2|\1>", line)
-
-        result.append(line)
-
-    return "\n".join(result)
-
-
-def split_message(text: str, limit: int = 3900) -> list[str]:
-    """Split a long message into chunks that fit Slack's character limit.
+def split_message(text: str, limit: int = 3900) -> Iterator[str]:
+    """Yield chunks of a long message that fit Slack's character limit.
 
     Splits on paragraph boundaries (double newlines) where possible,
     falling back to single newlines, then hard-truncating.
     """
-    if len(text) <= limit:
-        return [text]
-
-    parts = []
-    remaining = text
-
-    while remaining:
-        if len(remaining) <= limit:
-            parts.append(remaining)
-            break
+    # Walk the text with a cursor rather than re-slicing the remainder,
+    # which would copy the rest of the text on every split.
+    start, end = 0, len(text)
 
+    while end - start > limit:
         # Try to split at a paragraph boundary.
-        split_at = remaining.rfind("\n\n", 0, limit)
+        window_end = start + limit
+        split_at = text.rfind("\n\n", start, window_end)
         if split_at == -1:
-            split_at = remaining.rfind("\n", 0, limit)
+            split_at = text.rfind("\n", start, window_end)
         if split_at == -1:
-            split_at = limit
+            split_at = window_end
 
-        parts.append(remaining[:split_at])
-        remaining = remaining[split_at:].lstrip("\n")
+        yield text[start:split_at]
+        start = split_at
+        while start < end and text[start] == "\n":
+            start += 1
 
-    return parts
+    if start < end or not text:
+        yield text[start:]
@@ -1,22 +1,115 @@
 """Slash command handlers for the Slack research bot."""
 
 import asyncio
-import json
 import logging
+from typing import Callable
 
 from slack_bolt.async_app import AsyncApp
 
 from server.services.orchestrator import run_research_loop, run_claim_verification
 from slack_bot.formatting import md_to_mrkdwn, split_message
+from slack_bot.progress import SlackProgressBuffer
+from slack_bot.sse import SSEParser
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a failure notice to reach Slack.
+ERROR_NOTIFY_TIMEOUT = 3.0
+
+
+def _research_start_line(data: dict) -> str:
+    return (
+        f":hourglass_flowing_sand: *{data.get('agent', 'Agent')}* starting "
+        f"(iteration {data.get('iteration', 1)})..."
+    )
+
+
+def _verify_start_line(data: dict) -> str:
+    return f":hourglass_flowing_sand: *{data.get('agent', 'Agent')}* starting..."
+
+
+def _tool_call_line(data: dict) -> str:
+    return f":wrench: Using tool: `{data.get('tool_id', 'unknown')}`"
+
+
+def _agent_end_line(data: dict) -> str:
+    return f":white_check_mark: *{data.get('agent', 'Agent')}* finished."
+
+
+def _error_line(data: dict) -> str:
+    return f":x: *Error:* {data.get('message', 'Unknown error')}"
+
+
+def _verdict_line(data: dict) -> str:
+    verdict = data.get("verdict", "")
+    emoji = (
+        ":white_check_mark:"
+        if verdict == "PASS"
+        else ":arrows_counterclockwise:"
+    )
+    return (
+        f"{emoji} *Peer Review Verdict* "
+        f"(iteration {data.get('iteration', 1)}): `{verdict}`"
+    )
+
+
+# Progress line formatters keyed by SSE event type. "result" carries the
+# report itself and is handled by the caller before this lookup.
+RESEARCH_PROGRESS: dict[str, Callable[[dict], str]] = {
+    "agent_start": _research_start_line,
+    "tool_call": _tool_call_line,
+    "agent_end": _agent_end_line,
+    "verdict": _verdict_line,
+    "error": _error_line,
+}
+
+VERIFY_PROGRESS: dict[str, Callable[[dict], str]] = {
+    "agent_start": _verify_start_line,
+    "tool_call": _tool_call_line,
+    "agent_end": _agent_end_line,
+    "error": _error_line,
+}
+
+
+async def _post_report(client, channel_id: str, thread_ts: str, report) -> None:
+    """Post the report as threaded replies, in order, one chunk at a time."""
+    if not report:
+        return
+    for part in split_message(md_to_mrkdwn(report), 3900):
+        await client.chat_postMessage(
+            channel=channel_id,
+            thread_ts=thread_ts,
+            text=part,
+            unfurl_links=False,
+        )
+
+
+async def _notify_failure(client, channel_id: str, user_id: str,
+                          thread_ts: str | None, text: str) -> None:
+    """Tell the user a command failed, in its thread if one was started.
+
+    Bounded by ERROR_NOTIFY_TIMEOUT so an unhealthy Slack API can't hold
+    the failed task open.
+    """
+    if thread_ts is not None:
+        notify = client.chat_postMessage(
+            channel=channel_id, thread_ts=thread_ts, text=text,
+        )
+    else:
+        notify = client.chat_postEphemeral(
+            channel=channel_id, user=user_id, text=text,
+        )
+    try:
+        await asyncio.wait_for(notify, timeout=ERROR_NOTIFY_TIMEOUT)
+    except Exception:
+        logger.exception("Failed to send error message to Slack")
+
 
 def register_handlers(app: AsyncApp):
     """Register all slash command handlers."""
 
     @app.command("/research")
-    async def handle_research(ack, command, client, respond):
+    async def handle_research(ack, command, client):
         topic = command.get("text", "").strip()
         if not topic:
             await ack("Please provide a topic: `/research <your topic>`")
@@ -29,13 +122,15 @@ def register_handlers(app: AsyncApp):
 
         # Spawn background task so the HTTP response returns immediately.
         asyncio.create_task(
-            _run_research(topic, command, client, respond)
+            _run_research(topic, command, client)
         )
 
-    async def _run_research(topic, command, client, respond):
+    async def _run_research(topic, command, client):
         """Long-running research task that runs in the background."""
         channel_id = command["channel_id"]
         user_id = command["user_id"]
+        thread_ts = None
+        progress = None
 
         try:
             # Post initial status message (becomes the thread parent).
@@ -48,131 +143,54 @@ def register_handlers(app: AsyncApp):
             )
             thread_ts = initial["ts"]
 
-            # Track progress lines and the progress message ts.
-            progress_lines = []
-            progress_ts = None
+            # Progress lines are coalesced into one threaded message.
+            progress = SlackProgressBuffer(client, channel_id, thread_ts)
+            parser = SSEParser()
             report = None
             iteration_info = None
 
             async for sse_line in run_research_loop(topic):
-                if not sse_line.startswith("event: "):
-                    continue
-
-                lines = sse_line.strip().split("\n")
-                event_type = lines[0].replace("event: ", "")
-                data_str = (
-                    lines[1].replace("data: ", "") if len(lines) > 1 else "{}"
-                )
-
-                try:
-                    data = json.loads(data_str)
-                except json.JSONDecodeError:
-                    continue
-
-                update_text = None
-
-                if event_type == "agent_start":
-                    agent = data.get("agent", "Agent")
-                    iteration = data.get("iteration", 1)
-                    update_text = (
-                        f":hourglass_flowing_sand: *{agent}* starting "
-                        f"(iteration {iteration})..."
-                    )
-
-                elif event_type == "tool_call":
-                    tool_id = data.get("tool_id", "unknown")
-                    update_text = f":wrench: Using tool: `{tool_id}`"
-
-                elif event_type == "agent_end":
-                    agent = data.get("agent", "Agent")
-                    update_text = f":white_check_mark: *{agent}* finished."
-
-                elif event_type == "verdict":
-                    verdict = data.get("verdict", "")
-                    iteration = data.get("iteration", 1)
-                    emoji = (
-                        ":white_check_mark:"
-                        if verdict == "PASS"
-                        else ":arrows_counterclockwise:"
-                    )
-                    update_text = (
-                        f"{emoji} *Peer Review Verdict* "
-                        f"(iteration {iteration}): `{verdict}`"
-                    )
-
-                elif event_type == "result":
-                    report = data.get("report")
-                    iteration_info = data.get("iteration_info")
-
-                elif event_type == "error":
-                    msg = data.get("message", "Unknown error")
-                    update_text = f":x: *Error:* {msg}"
-
-                # Update the progress message in the thread.
-                if update_text:
-                    progress_lines.append(update_text)
-                    full_text = "\n".join(progress_lines)
-                    if progress_ts:
-                        await client.chat_update(
-                            channel=channel_id,
-                            ts=progress_ts,
-                            text=full_text,
-                        )
-                    else:
-                        msg = await client.chat_postMessage(
-                            channel=channel_id,
-                            thread_ts=thread_ts,
-                            text=full_text,
-                        )
-                        progress_ts = msg["ts"]
+                for event_type, data in parser.feed(sse_line):
+                    if event_type == "result":
+                        report = data.get("report")
+                        iteration_info = data.get("iteration_info")
+                        continue
+
+                    format_line = RESEARCH_PROGRESS.get(event_type)
+                    if format_line is not None:
+                        progress.append(format_line(data))
 
             # Mark progress as complete.
-            if progress_ts:
-                progress_lines.append(
-                    "\n:white_check_mark: *Research complete!*"
-                )
-                await client.chat_update(
-                    channel=channel_id,
-                    ts=progress_ts,
-                    text="\n".join(progress_lines),
-                )
-
-            # Post the full report as threaded replies.
-            if report:
-                mrkdwn_report = md_to_mrkdwn(report)
-                parts = split_message(mrkdwn_report, 3900)
-                for part in parts:
-                    await client.chat_postMessage(
-                        channel=channel_id,
-                        thread_ts=thread_ts,
-                        text=part,
-                        unfurl_links=False,
-                    )
-
-            # Update the parent message to show completion.
+            await progress.finish("\n:white_check_mark: *Research complete!*")
+
+            # Post the report into the thread while the parent message
+            # is marked complete; the two calls don't depend on each other.
             status = iteration_info or "Complete"
-            await client.chat_update(
-                channel=channel_id,
-                ts=thread_ts,
-                text=(
-                    f":white_check_mark: *Research complete:* _{topic}_\n"
-                    f"{status}\n\n"
-                    f"See thread for full report. Requested by <@{user_id}>"
+            await asyncio.gather(
+                _post_report(client, channel_id, thread_ts, report),
+                client.chat_update(
+                    channel=channel_id,
+                    ts=thread_ts,
+                    text=(
+                        f":white_check_mark: *Research complete:* _{topic}_\n"
+                        f"{status}\n\n"
+                        f"See thread for full report. Requested by <@{user_id}>"
+                    ),
                 ),
             )
 
         except Exception:
             logger.exception("Research command failed for topic: %s", topic)
-            try:
-                await respond(
-                    f":x: Something went wrong while researching *{topic}*. "
-                    "Please try again."
-                )
-            except Exception:
-                logger.exception("Failed to send error response to Slack")
+            if progress is not None:
+                await progress.close()
+            await _notify_failure(
+                client, channel_id, user_id, thread_ts,
+                f":x: Something went wrong while researching *{topic}*. "
+                "Please try again.",
+            )
 
     @app.command("/check-claim")
-    async def handle_verify(ack, command, client, respond):
+    async def handle_verify(ack, command, client):
         claim = command.get("text", "").strip()
         if not claim:
             await ack("Please provide a claim: `/check-claim <your claim>`")
@@ -184,13 +202,15 @@ def register_handlers(app: AsyncApp):
         )
 
         asyncio.create_task(
-            _run_verification(claim, command, client, respond)
+            _run_verification(claim, command, client)
         )
 
-    async def _run_verification(claim, command, client, respond):
+    async def _run_verification(claim, command, client):
         """Long-running verification task that runs in the background."""
         channel_id = command["channel_id"]
         user_id = command["user_id"]
+        thread_ts = None
+        progress = None
 
         try:
             initial = await client.chat_postMessage(
@@ -202,105 +222,46 @@ def register_handlers(app: AsyncApp):
             )
             thread_ts = initial["ts"]
 
-            progress_lines = []
-            progress_ts = None
+            progress = SlackProgressBuffer(client, channel_id, thread_ts)
+            parser = SSEParser()
             report = None
             iteration_info = None
 
             async for sse_line in run_claim_verification(claim):
-                if not sse_line.startswith("event: "):
-                    continue
-
-                lines = sse_line.strip().split("\n")
-                event_type = lines[0].replace("event: ", "")
-                data_str = (
-                    lines[1].replace("data: ", "") if len(lines) > 1 else "{}"
-                )
-
-                try:
-                    data = json.loads(data_str)
-                except json.JSONDecodeError:
-                    continue
-
-                update_text = None
-
-                if event_type == "agent_start":
-                    agent = data.get("agent", "Agent")
-                    update_text = (
-                        f":hourglass_flowing_sand: *{agent}* starting..."
-                    )
-
-                elif event_type == "tool_call":
-                    tool_id = data.get("tool_id", "unknown")
-                    update_text = f":wrench: Using tool: `{tool_id}`"
-
-                elif event_type == "agent_end":
-                    agent = data.get("agent", "Agent")
-                    update_text = f":white_check_mark: *{agent}* finished."
-
-                elif event_type == "result":
-                    report = data.get("report")
-                    iteration_info = data.get("iteration_info")
-
-                elif event_type == "error":
-                    msg = data.get("message", "Unknown error")
-                    update_text = f":x: *Error:* {msg}"
-
-                if update_text:
-                    progress_lines.append(update_text)
-                    full_text = "\n".join(progress_lines)
-                    if progress_ts:
-                        await client.chat_update(
-                            channel=channel_id,
-                            ts=progress_ts,
-                            text=full_text,
-                        )
-                    else:
-                        msg = await client.chat_postMessage(
-                            channel=channel_id,
-                            thread_ts=thread_ts,
-                            text=full_text,
-                        )
-                        progress_ts = msg["ts"]
-
-            if progress_ts:
-                progress_lines.append(
-                    "\n:white_check_mark: *Verification complete!*"
-                )
-                await client.chat_update(
-                    channel=channel_id,
-                    ts=progress_ts,
-                    text="\n".join(progress_lines),
-                )
-
-            if report:
-                mrkdwn_report = md_to_mrkdwn(report)
-                parts = split_message(mrkdwn_report, 3900)
-                for part in parts:
-                    await client.chat_postMessage(
-                        channel=channel_id,
-                        thread_ts=thread_ts,
-                        text=part,
-                        unfurl_links=False,
-                    )
+                for event_type, data in parser.feed(sse_line):
+                    if event_type == "result":
+                        report = data.get("report")
+                        iteration_info = data.get("iteration_info")
+                        continue
+
+                    format_line = VERIFY_PROGRESS.get(event_type)
+                    if format_line is not None:
+                        progress.append(format_line(data))
+
+            await progress.finish("\n:white_check_mark: *Verification complete!*")
 
+            # Post the report into the thread while the parent message
+            # is marked complete; the two calls don't depend on each other.
             status = iteration_info or "Complete"
-            await client.chat_update(
-                channel=channel_id,
-                ts=thread_ts,
-                text=(
-                    f":white_check_mark: *Verification complete:* _{claim}_\n"
-                    f"{status}\n\n"
-                    f"See thread for full report. Requested by <@{user_id}>"
+            await asyncio.gather(
+                _post_report(client, channel_id, thread_ts, report),
+                client.chat_update(
+                    channel=channel_id,
+                    ts=thread_ts,
+                    text=(
+                        f":white_check_mark: *Verification complete:* _{claim}_\n"
+                        f"{status}\n\n"
+                        f"See thread for full report. Requested by <@{user_id}>"
+                    ),
                 ),
             )
 
         except Exception:
             logger.exception("Verify command failed for claim: %s", claim)
-            try:
-                await respond(
-                    f":x: Something went wrong while verifying *{claim}*. "
-                    "Please try again."
-                )
-            except Exception:
-                logger.exception("Failed to send error response to Slack")
+            if progress is not None:
+                await progress.close()
+            await _notify_failure(
+                client, channel_id, user_id, thread_ts,
+                f":x: Something went wrong while verifying *{claim}*. "
+                "Please try again.",
+            )
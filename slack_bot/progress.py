@@ -0,0 +1,106 @@
+"""Coalesced progress updates for a threaded Slack message."""
+
+import asyncio
+import contextlib
+import functools
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+
+# chat.update is rate limited (Tier 3, ~50/min), so progress is pushed at
+# most this often rather than once per orchestrator event.
+FLUSH_INTERVAL = 0.75
+
+
+class SlackProgressBuffer:
+    """Accumulate progress lines and mirror them into one thread reply.
+
+    The first flush posts the reply and later flushes edit it in place.
+    Lines appended within FLUSH_INTERVAL of each other go out in a single
+    Slack call.
+    """
+
+    def __init__(self, client, channel_id: str, thread_ts: str,
+                 interval: float = FLUSH_INTERVAL):
+        self.client = client
+        self.channel_id = channel_id
+        self.thread_ts = thread_ts
+        self.interval = interval
+        # Lines are written into one buffer so appends don't re-copy or
+        # re-join everything seen so far.
+        self.text = io.StringIO()
+        self.progress_ts: str | None = None
+        # Posts the reply on first use, then rebinds itself to chat_update.
+        self._send = self._post_first
+        self.dirty = False
+        self._loop = asyncio.get_running_loop()
+        self._timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+
+    def append(self, line: str) -> None:
+        """Add a progress line; it is sent with the next flush."""
+        if self.text.tell():
+            self.text.write("\n")
+        self.text.write(line)
+        self.dirty = True
+        if self._timer is None and self._flush_task is None:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        self._timer = self._loop.call_later(self.interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._timer = None
+        self._flush_task = self._loop.create_task(self._timed_flush())
+
+    async def _timed_flush(self) -> None:
+        """Flush once, then re-arm the timer if lines arrived meanwhile."""
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Failed to update Slack progress message")
+        self._flush_task = None
+        if self.dirty:
+            self._schedule_flush()
+
+    async def flush(self) -> None:
+        """Send all lines to Slack now."""
+        self.dirty = False
+        await self._send(text=self.text.getvalue())
+
+    async def _post_first(self, text: str) -> None:
+        msg = await self.client.chat_postMessage(
+            channel=self.channel_id,
+            thread_ts=self.thread_ts,
+            text=text,
+        )
+        self.progress_ts = msg["ts"]
+        self._send = functools.partial(
+            self.client.chat_update,
+            channel=self.channel_id,
+            ts=self.progress_ts,
+        )
+
+    async def finish(self, final_line: str) -> None:
+        """Wait for pending updates, then add final_line if anything was posted."""
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self.text.tell():
+            self.text.write("\n" + final_line)
+            await self.flush()
+
+    async def close(self) -> None:
+        """Drop pending updates so nothing is posted after a failure."""
+        self.dirty = False
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
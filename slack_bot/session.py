@@ -0,0 +1,43 @@
+"""Shared aiohttp session for Slack Web API calls."""
+
+import aiohttp
+
+# Without a session, slack_sdk opens (and TLS-handshakes) a new aiohttp
+# session for every API call. Sharing one keeps connections to slack.com
+# alive across chat_postMessage/chat_update bursts and across commands.
+_session: aiohttp.ClientSession | None = None
+
+
+def get_session() -> aiohttp.ClientSession:
+    """Return the shared session, creating it on first use.
+
+    Must be called from inside the running event loop.
+    """
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=50,
+                limit_per_host=20,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+            ),
+        )
+    return _session
+
+
+def attach_session(app) -> None:
+    """Route an AsyncApp's Web API calls through the shared session.
+
+    Bolt copies the app client's session into the per-request clients it
+    builds for OAuth installs, so this covers every workspace.
+    """
+    app.client.session = get_session()
+
+
+async def close_session() -> None:
+    """Close the shared session. Called on app shutdown."""
+    global _session
+    if _session is not None:
+        await _session.close()
+        _session = None
@@ -0,0 +1,82 @@
+"""Incremental parser for the orchestrator's SSE event stream."""
+
+import sys
+from typing import Iterator
+
+import orjson
+
+
+class SSEParser:
+    """Turn raw SSE bytes into (event_type, data) pairs as they arrive.
+
+    Chunks may split or join events arbitrarily; partial lines are kept
+    until the rest arrives. An event is dispatched on the blank line that
+    ends it. Events without data get {} and events whose data is not valid
+    JSON are dropped.
+    """
+
+    def __init__(self):
+        self._pending = b""
+        self.event: bytes | None = None
+        self.data_buf: list[bytes] = []
+
+    def feed(self, chunk: bytes) -> Iterator[tuple[str, dict]]:
+        """Consume a chunk and yield every event it completes."""
+        if (
+            not self._pending and self.event is None and not self.data_buf
+            and chunk.startswith(b"event: ")
+        ):
+            # The orchestrator yields exactly one "event: X\ndata: {...}\n\n"
+            # frame per chunk; slice that shape directly.
+            nl = chunk.find(b"\n")
+            data_end = len(chunk) - 2
+            if (
+                chunk.startswith(b"data: ", nl + 1)
+                and chunk.find(b"\n", nl + 7) == data_end
+                and chunk.endswith(b"\n\n")
+            ):
+                event = _decode(chunk[7:nl], chunk[nl + 7:data_end])
+                if event is not None:
+                    yield event
+                return
+
+        buf = self._pending + chunk if self._pending else chunk
+        start = 0
+        while (end := buf.find(b"\n", start)) != -1:
+            line = buf[start:end]
+            start = end + 1
+            if not line:
+                event = self._dispatch()
+                if event is not None:
+                    yield event
+            elif line.startswith(b"event:"):
+                self.event = _field_value(line, 6)
+            elif line.startswith(b"data:"):
+                self.data_buf.append(_field_value(line, 5))
+        self._pending = buf[start:]
+
+    def _dispatch(self) -> tuple[str, dict] | None:
+        """Finish the current event and reset for the next one."""
+        event, data_buf = self.event, self.data_buf
+        self.event, self.data_buf = None, []
+        if event is None:
+            return None
+        return _decode(event, b"\n".join(data_buf) if data_buf else b"")
+
+
+def _decode(event: bytes, payload: bytes) -> tuple[str, dict] | None:
+    """Build an (event_type, data) pair; None if the payload isn't JSON."""
+    try:
+        data = orjson.loads(payload) if payload else {}
+    except orjson.JSONDecodeError:
+        return None
+    # Interned so the handlers' dispatch-table lookups match their keys by
+    # identity.
+    return sys.intern(event.decode()), data
+
+
+def _field_value(line: bytes, prefix_len: int) -> bytes:
+    """Strip a field name and the single optional space after its colon."""
+    if line[prefix_len:prefix_len + 1] == b" ":
+        return line[prefix_len + 1:]
+    return line[prefix_len:]
@@ -1,17 +1,42 @@
 """Validate the ingestion pipeline by running keyword, vector, ES|QL, and spot-check queries."""
 
+import functools
+import io
 import sys
-
-from sentence_transformers import SentenceTransformer
+from concurrent.futures import ThreadPoolExecutor
 
 from config import EMBEDDING_MODEL, get_es_client
 
 
-def keyword_search(es):
+@functools.lru_cache(maxsize=1)
+def get_model():
+    """Load the embedding model on first use.
+
+    Imported lazily: sentence_transformers pulls in torch, which only the
+    vector check needs.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    print(f"Loading embedding model: {EMBEDDING_MODEL} ({device})")
+    model = SentenceTransformer(EMBEDDING_MODEL, device=device)
+    if device == "cuda":
+        model.half()
+    return model
+
+
+@functools.lru_cache(maxsize=32)
+def embed_query(text):
+    """Encode a query once; repeated queries reuse the vector."""
+    return tuple(get_model().encode(text).tolist())
+
+
+def keyword_search(es, out=None):
     """BM25 keyword search on chunk_text for 'multi-agent'."""
-    print("\n" + "-" * 50)
-    print("1. KEYWORD SEARCH: 'multi-agent' on papers_chunks")
-    print("-" * 50)
+    print("\n" + "-" * 50, file=out)
+    print("1. KEYWORD SEARCH: 'multi-agent' on papers_chunks", file=out)
+    print("-" * 50, file=out)
 
     resp = es.search(
         index="papers_chunks",
@@ -23,25 +48,29 @@ def keyword_search(es):
     )
 
     hits = resp["hits"]["hits"]
-    print(f"Total hits: {resp['hits']['total']['value']}")
+    print(f"Total hits: {resp['hits']['total']['value']}", file=out)
     for i, hit in enumerate(hits):
         src = hit["_source"]
         snippet = src["chunk_text"][:200].replace("\n", " ")
-        print(f"\n  [{i+1}] score={hit['_score']:.2f} | {src['chunk_id']}")
-        print(f"      section: {src['section_type']}")
-        print(f"      text: {snippet}...")
+        print(f"\n  [{i+1}] score={hit['_score']:.2f} | {src['chunk_id']}", file=out)
+        print(f"      section: {src['section_type']}", file=out)
+        print(f"      text: {snippet}...", file=out)
 
     return len(hits) > 0
 
 
-def vector_search(es, model):
+def vector_search(es, out=None):
     """KNN vector search on chunk_embedding."""
-    print("\n" + "-" * 50)
-    print("2. VECTOR SEARCH: 'how do AI agents handle errors?'")
-    print("-" * 50)
+    print("\n" + "-" * 50, file=out)
+    print("2. VECTOR SEARCH: 'how do AI agents handle errors?'", file=out)
+    print("-" * 50, file=out)
 
     query_text = "how do AI agents handle errors?"
-    query_vec = model.encode(query_text).tolist()
+    try:
+        query_vec = embed_query(query_text)
+    except ImportError as e:
+        print(f"  Embedding model unavailable: {e}", file=out)
+        return False
 
     resp = es.search(
         index="papers_chunks",
@@ -57,22 +86,22 @@ def vector_search(es, model):
     )
 
     hits = resp["hits"]["hits"]
-    print(f"Total hits: {len(hits)}")
+    print(f"Total hits: {len(hits)}", file=out)
     for i, hit in enumerate(hits):
         src = hit["_source"]
         snippet = src["chunk_text"][:200].replace("\n", " ")
-        print(f"\n  [{i+1}] score={hit['_score']:.4f} | {src['chunk_id']}")
-        print(f"      section: {src['section_type']}")
-        print(f"      text: {snippet}...")
+        print(f"\n  [{i+1}] score={hit['_score']:.4f} | {src['chunk_id']}", file=out)
+        print(f"      section: {src['section_type']}", file=out)
+        print(f"      text: {snippet}...", file=out)
 
     return len(hits) > 0
 
 
-def esql_search(es):
+def esql_search(es, out=None):
     """ES|QL aggregation query on papers_metadata."""
-    print("\n" + "-" * 50)
-    print("3. ES|QL: Papers per year (>= 2023)")
-    print("-" * 50)
+    print("\n" + "-" * 50, file=out)
+    print("3. ES|QL: Papers per year (>= 2023)", file=out)
+    print("-" * 50, file=out)
 
     query = (
         "FROM papers_metadata "
@@ -87,23 +116,23 @@ def esql_search(es):
         values = resp.get("values", [])
 
         col_names = [c["name"] for c in columns]
-        print(f"  {'  |  '.join(col_names)}")
-        print(f"  {'-' * 20}")
+        print(f"  {'  |  '.join(col_names)}", file=out)
+        print(f"  {'-' * 20}", file=out)
         for row in values:
-            print(f"  {row[0]:>5}  |  {row[1]}")
+            print(f"  {row[0]:>5}  |  {row[1]}", file=out)
 
         return len(values) > 0
     except Exception as e:
-        print(f"  ES|QL query failed: {e}")
-        print("  (ES|QL requires Elasticsearch 8.11+)")
+        print(f"  ES|QL query failed: {e}", file=out)
+        print("  (ES|QL requires Elasticsearch 8.11+)", file=out)
         return False
 
 
-def spot_check(es):
+def spot_check(es, out=None):
     """Pick one paper and show its chunk count + first chunk."""
-    print("\n" + "-" * 50)
-    print("4. SPOT CHECK: Random paper chunk details")
-    print("-" * 50)
+    print("\n" + "-" * 50, file=out)
+    print("4. SPOT CHECK: Random paper chunk details", file=out)
+    print("-" * 50, file=out)
 
     # Get a paper_id from metadata
     meta_resp = es.search(
@@ -112,44 +141,51 @@ def spot_check(es):
     )
 
     if not meta_resp["hits"]["hits"]:
-        print("  No papers found in metadata index")
+        print("  No papers found in metadata index", file=out)
         return False
 
     paper = meta_resp["hits"]["hits"][0]["_source"]
     paper_id = paper["paper_id"]
     title = paper["title"]
 
-    print(f"  Paper: {title[:80]}")
-    print(f"  ID: {paper_id}")
+    print(f"  Paper: {title[:80]}", file=out)
+    print(f"  ID: {paper_id}", file=out)
 
-    # Count chunks for this paper
-    count_resp = es.count(
-        index="papers_chunks",
-        body={"query": {"term": {"paper_id": paper_id}}},
-    )
-    chunk_count = count_resp["count"]
-    print(f"  Chunks: {chunk_count}")
-
-    # Get first chunk
+    # One request returns both the exact chunk count and the first chunk
     chunk_resp = es.search(
         index="papers_chunks",
         body={
             "query": {"term": {"paper_id": paper_id}},
             "sort": [{"chunk_index": "asc"}],
             "size": 1,
+            "track_total_hits": True,
             "_source": ["chunk_id", "section_type", "chunk_text"],
         },
     )
+    chunk_count = chunk_resp["hits"]["total"]["value"]
+    print(f"  Chunks: {chunk_count}", file=out)
 
     if chunk_resp["hits"]["hits"]:
         chunk = chunk_resp["hits"]["hits"][0]["_source"]
         snippet = chunk["chunk_text"][:300].replace("\n", " ")
-        print(f"  First chunk ({chunk['chunk_id']}, {chunk['section_type']}):")
-        print(f"    {snippet}...")
+        print(
+            f"  First chunk ({chunk['chunk_id']}, {chunk['section_type']}):",
+            file=out,
+        )
+        print(f"    {snippet}...", file=out)
 
     return chunk_count > 0
 
 
+# Validation checks, in report order.
+CHECKS = {
+    "keyword": keyword_search,
+    "vector": vector_search,
+    "esql": esql_search,
+    "spot_check": spot_check,
+}
+
+
 def main():
     print("=" * 60)
     print("SEARCH VALIDATION TESTS")
@@ -165,14 +201,20 @@ def main():
         print(f"Error: Elasticsearch connection failed: {e}")
         sys.exit(1)
 
-    print(f"Loading embedding model: {EMBEDDING_MODEL}")
-    model = SentenceTransformer(EMBEDDING_MODEL)
+    # The checks are independent, so they run concurrently; the others
+    # proceed while the vector check loads the embedding model. Each writes
+    # to its own buffer so the report prints in order.
+    outputs = {name: io.StringIO() for name in CHECKS}
+    with ThreadPoolExecutor(max_workers=len(CHECKS)) as executor:
+        futures = {
+            name: executor.submit(check, es, outputs[name])
+            for name, check in CHECKS.items()
+        }
 
     results = {}
-    results["keyword"] = keyword_search(es)
-    results["vector"] = vector_search(es, model)
-    results["esql"] = esql_search(es)
-    results["spot_check"] = spot_check(es)
+    for name in CHECKS:
+        print(outputs[name].getvalue(), end="")
+        results[name] = futures[name].result()
 
     print("\n" + "=" * 60)
     print("RESULTS SUMMARY")
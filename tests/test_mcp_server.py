@@ -4,9 +4,8 @@ Run with:  py -m pytest tests/test_mcp_server.py -v
 """
 
 import asyncio
-import json
-from unittest.mock import AsyncMock, patch
 
+import orjson
 import pytest
 
 from server.mcp_server import mcp, research_literature_review
@@ -56,9 +55,9 @@ class TestToolRegistration:
 # 2. SSE parsing / integration tests (mock orchestrator)
 # ---------------------------------------------------------------------------
 
-def _sse(event: str, data: dict) -> str:
-    """Build an SSE string identical to what the real orchestrator yields."""
-    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+def _sse(event: str, data: dict) -> bytes:
+    """Build an SSE event identical to what the real orchestrator yields."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
 
 
 # Simulates a successful single-iteration run
@@ -116,157 +115,142 @@ MOCK_SSE_TWO_ITERATIONS = [
 
 
 async def _mock_generator(sse_events):
-    """Async generator that yields pre-built SSE strings."""
+    """Async generator that yields pre-built SSE events."""
     for event in sse_events:
         yield event
 
 
-def _make_mock_ctx():
-    """Create a mock Context with async methods."""
-    ctx = AsyncMock()
-    ctx.info = AsyncMock()
-    ctx.debug = AsyncMock()
-    ctx.report_progress = AsyncMock()
-    return ctx
+def _patch_research_loop(monkeypatch, sse_events):
+    """Make the orchestrator's research loop yield pre-built SSE events."""
+    monkeypatch.setattr(
+        "server.services.orchestrator.run_research_loop",
+        lambda *args, **kwargs: _mock_generator(sse_events),
+    )
+
+
+class SimpleCtx:
+    """Stand-in for the MCP Context that records what the tool reports."""
+
+    def __init__(self):
+        self.info_calls = []
+        self.progress_calls = 0
+
+    async def info(self, message):
+        self.info_calls.append(message)
+
+    async def debug(self, message):
+        pass
+
+    async def report_progress(self, *args, **kwargs):
+        self.progress_calls += 1
 
 
 class TestSSEParsing:
     """Test the tool function's SSE parsing with mocked orchestrator."""
 
     @pytest.mark.asyncio
-    async def test_successful_run_returns_report(self):
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(MOCK_SSE_SUCCESS),
-        ):
-            result = await research_literature_review(topic="test topic", ctx=ctx)
+    async def test_successful_run_returns_report(self, monkeypatch):
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, MOCK_SSE_SUCCESS)
+        result = await research_literature_review(topic="test topic", ctx=ctx)
 
         assert "# Literature Review" in result
         assert "This is the final report." in result
         assert "Iteration 1 (verdict: PASS)" in result
 
     @pytest.mark.asyncio
-    async def test_successful_run_reports_progress(self):
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(MOCK_SSE_SUCCESS),
-        ):
-            await research_literature_review(topic="test topic", ctx=ctx)
+    async def test_successful_run_reports_progress(self, monkeypatch):
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, MOCK_SSE_SUCCESS)
+        await research_literature_review(topic="test topic", ctx=ctx)
 
         # Should have called ctx.info for agent_start, reasoning, tool_call, agent_end, verdict
-        info_messages = [call.args[0] for call in ctx.info.call_args_list]
-        assert any("Research Agent starting" in m for m in info_messages)
-        assert any("Peer Review Agent" in m for m in info_messages)
-        assert any("PASS" in m for m in info_messages)
+        assert any("Research Agent starting" in m for m in ctx.info_calls)
+        assert any("Peer Review Agent" in m for m in ctx.info_calls)
+        assert any("PASS" in m for m in ctx.info_calls)
 
         # Should have reported progress
-        assert ctx.report_progress.call_count > 0
+        assert ctx.progress_calls > 0
 
     @pytest.mark.asyncio
-    async def test_error_event_returns_error_string(self):
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(MOCK_SSE_ERROR),
-        ):
-            result = await research_literature_review(topic="test topic", ctx=ctx)
+    async def test_error_event_returns_error_string(self, monkeypatch):
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, MOCK_SSE_ERROR)
+        result = await research_literature_review(topic="test topic", ctx=ctx)
 
         assert result.startswith("Error:")
         assert "timed out" in result
 
     @pytest.mark.asyncio
-    async def test_empty_run_returns_no_report_error(self):
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(MOCK_SSE_EMPTY),
-        ):
-            result = await research_literature_review(topic="test topic", ctx=ctx)
+    async def test_empty_run_returns_no_report_error(self, monkeypatch):
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, MOCK_SSE_EMPTY)
+        result = await research_literature_review(topic="test topic", ctx=ctx)
 
         assert result == "Error: No report was generated."
 
     @pytest.mark.asyncio
-    async def test_two_iteration_run(self):
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(MOCK_SSE_TWO_ITERATIONS),
-        ):
-            result = await research_literature_review(topic="test topic", ctx=ctx)
+    async def test_two_iteration_run(self, monkeypatch):
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, MOCK_SSE_TWO_ITERATIONS)
+        result = await research_literature_review(topic="test topic", ctx=ctx)
 
         assert "# Revised Report" in result
         assert "Iteration 2 (verdict: PASS)" in result
 
         # Should have reported both REVISION_NEEDED and PASS verdicts
-        info_messages = [call.args[0] for call in ctx.info.call_args_list]
-        assert any("REVISION_NEEDED" in m for m in info_messages)
-        assert any("PASS" in m for m in info_messages)
+        assert any("REVISION_NEEDED" in m for m in ctx.info_calls)
+        assert any("PASS" in m for m in ctx.info_calls)
 
     @pytest.mark.asyncio
-    async def test_tool_call_logged(self):
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(MOCK_SSE_SUCCESS),
-        ):
-            await research_literature_review(topic="test topic", ctx=ctx)
+    async def test_tool_call_logged(self, monkeypatch):
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, MOCK_SSE_SUCCESS)
+        await research_literature_review(topic="test topic", ctx=ctx)
 
-        info_messages = [call.args[0] for call in ctx.info.call_args_list]
-        assert any("search_papers" in m for m in info_messages)
+        assert any("search_papers" in m for m in ctx.info_calls)
 
     @pytest.mark.asyncio
-    async def test_reasoning_truncated_to_150_chars(self):
+    async def test_reasoning_truncated_to_150_chars(self, monkeypatch):
         long_reasoning = "A" * 300
         events = [
             _sse("reasoning", {"text": long_reasoning}),
             _sse("result", {"report": "done", "iteration_info": None}),
             _sse("done", {}),
         ]
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(events),
-        ):
-            await research_literature_review(topic="test", ctx=ctx)
-
-        info_messages = [call.args[0] for call in ctx.info.call_args_list]
-        reasoning_msgs = [m for m in info_messages if m.startswith("Thinking:")]
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, events)
+        await research_literature_review(topic="test", ctx=ctx)
+
+        reasoning_msgs = [m for m in ctx.info_calls if m.startswith("Thinking:")]
         assert len(reasoning_msgs) == 1
         # "Thinking: " is 10 chars + 150 chars of content = 160 max
         assert len(reasoning_msgs[0]) <= 160
 
     @pytest.mark.asyncio
-    async def test_malformed_json_skipped_gracefully(self):
+    async def test_malformed_json_skipped_gracefully(self, monkeypatch):
         events = [
-            "event: agent_start\ndata: {not valid json}\n\n",
+            b"event: agent_start\ndata: {not valid json}\n\n",
             _sse("result", {"report": "Final report", "iteration_info": None}),
             _sse("done", {}),
         ]
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(events),
-        ):
-            result = await research_literature_review(topic="test", ctx=ctx)
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, events)
+        result = await research_literature_review(topic="test", ctx=ctx)
 
         assert "Final report" in result
 
     @pytest.mark.asyncio
-    async def test_non_sse_lines_skipped(self):
+    async def test_non_sse_lines_skipped(self, monkeypatch):
         events = [
-            "some random line",
-            ": comment line",
+            b"some random line",
+            b": comment line",
             _sse("result", {"report": "Report content", "iteration_info": None}),
             _sse("done", {}),
         ]
-        ctx = _make_mock_ctx()
-        with patch(
-            "server.services.orchestrator.run_research_loop",
-            return_value=_mock_generator(events),
-        ):
-            result = await research_literature_review(topic="test", ctx=ctx)
+        ctx = SimpleCtx()
+        _patch_research_loop(monkeypatch, events)
+        result = await research_literature_review(topic="test", ctx=ctx)
 
         assert "Report content" in result
 